@@ -4,6 +4,7 @@ from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext_lazy as _
 
 from coreapp import models
+from coreapp.paginator import EstimatedCountPaginator
 
 class UserAdmin(BaseUserAdmin):
     """Define the admin pages for users."""
@@ -37,31 +38,41 @@ class UserAdmin(BaseUserAdmin):
     ordering = ['email']
     filter_horizontal = []
     list_per_page = 20
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
     
 class PropertyAdmin(admin.ModelAdmin):
     """Define the admin pages for properties."""
     list_display = ['name', 'price', 'owner', 'property_type', 'category']
-    search_fields = ['name', 'owner__username']
+    list_select_related = ['owner']
+    # Trigram lookups use the rent_name_trgm / rent_location_trgm GIN indexes.
+    search_fields = ['name__trigram_word_similar', 'location__trigram_word_similar', '=owner__email']
     list_filter = ['property_type', 'category']
-    ordering = ['-created_at']
+    ordering = ['-id']
     list_per_page = 20
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    raw_id_fields = ['owner']
     fieldsets = (
-        (None, {'fields': ('name', 'description', 'price', 'owner', 'type', 'category')}),
+        (None, {'fields': ('name', 'description', 'price', 'owner', 'property_type', 'category', 'location')}),
         (_('Contact Info'), {'fields': ('contact_number', 'contact_email')}),
-        (_('Property Details'), {'fields': ('bedrooms', 'bathrooms', 'parking_spaces')}),
+        (_('Property Details'), {'fields': ('bedrooms', 'bathrooms', 'parking_spaces', 'is_active', 'image')}),
     )
 
 class MessageAdmin(admin.ModelAdmin):
     """Define the admin pages for messages."""
     list_display = ['rent', 'message', 'created_at']
-    search_fields = ['name', 'email']
-    ordering = ['-created_at']
+    list_select_related = ['rent']
+    search_fields = ['rent__name__trigram_word_similar']
+    ordering = ['-id']
     list_per_page = 20
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    raw_id_fields = ['rent']
     fieldsets = (
-        (None, {'fields': ('name', 'email', 'message')}),
-        (_('Contact Info'), {'fields': ('phone_number',)}),
+        (None, {'fields': ('rent', 'message')}),
     )
     
 admin.site.register(models.User, UserAdmin)
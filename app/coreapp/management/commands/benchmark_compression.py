@@ -0,0 +1,45 @@
+"""
+Benchmark response compression on real API payloads.
+
+Reports the bytes on the wire and the CPU time per response for each
+encoding and level, so ``COMPRESSION_*`` settings can be tuned.
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from ecommerce.compression import available_encodings, compress
+
+DEFAULT_PATHS = ['/api/property/list/', '/api/property/search/', '/api/user/list/']
+LEVELS = {'gzip': [1, 6, 9], 'br': [1, 4, 11]}
+
+
+class Command(BaseCommand):
+    help = 'Measure compressed size and CPU cost per response for API payloads.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', default=DEFAULT_PATHS)
+        parser.add_argument('--iterations', type=int, default=50)
+
+    def handle(self, *args, **options):
+        host = next((host for host in settings.ALLOWED_HOSTS if '*' not in host), 'localhost')
+        client = Client(HTTP_HOST=host.lstrip('.'), HTTP_ACCEPT_ENCODING='identity')
+        self.stdout.write(f"{'path':<28} {'encoding':<8} {'level':>5} {'bytes':>10} {'ratio':>6} {'ms/resp':>8}")
+        for path in options['paths']:
+            response = client.get(path)
+            if response.status_code != 200:
+                raise CommandError(f'GET {path} returned {response.status_code}')
+            content = response.content
+            self.stdout.write(f"{path:<28} {'identity':<8} {'-':>5} {len(content):>10} {1:>6.2f} {0:>8.3f}")
+            for encoding in available_encodings():
+                for level in LEVELS[encoding]:
+                    started = time.process_time()
+                    for _ in range(options['iterations']):
+                        compressed = compress(content, encoding, level=level)
+                    elapsed = (time.process_time() - started) / options['iterations']
+                    ratio = len(compressed) / len(content) if content else 1
+                    self.stdout.write(
+                        f'{path:<28} {encoding:<8} {level:>5} {len(compressed):>10} {ratio:>6.2f} {elapsed * 1000:>8.3f}'
+                    )
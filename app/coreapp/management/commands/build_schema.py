@@ -0,0 +1,24 @@
+"""
+Build the OpenAPI schema served at ``/api/schema/``.
+
+Run at deploy (after ``migrate``) so no request pays for schema generation;
+rerun whenever the API changes. Skipped under ``API_ONLY=1``: those workers
+do not serve the schema and load no-op OpenAPI annotations, so the schema they
+would write is incomplete.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ecommerce.schema import build_schema
+
+
+class Command(BaseCommand):
+    help = 'Generate the OpenAPI schema and its precompressed copies.'
+
+    def handle(self, *args, **options):
+        if settings.API_ONLY:
+            self.stdout.write('API_ONLY is set; the schema is built by the docs process.')
+            return
+        rendered = build_schema()
+        sizes = ', '.join(f'{fmt} {len(content)} bytes' for fmt, content in rendered.items())
+        self.stdout.write(self.style.SUCCESS(f'Wrote schema to {settings.OPENAPI_SCHEMA_DIR} ({sizes}).'))
@@ -0,0 +1,37 @@
+"""
+Write precompressed copies of collected static files.
+
+Run after ``collectstatic`` so nginx can serve the ``.gz`` files with
+``gzip_static`` instead of compressing per request. No ``.br`` files are
+written: the proxy's nginx build has no Brotli module to serve them.
+"""
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ecommerce.compression import compress
+
+
+class Command(BaseCommand):
+    help = 'Precompress collected static files with gzip.'
+
+    def handle(self, *args, **options):
+        written = 0
+        for directory, _, filenames in os.walk(settings.STATIC_ROOT):
+            for filename in filenames:
+                if os.path.splitext(filename)[1] not in settings.COMPRESSION_STATIC_EXTENSIONS:
+                    continue
+                path = os.path.join(directory, filename)
+                with open(path, 'rb') as source:
+                    content = source.read()
+                if len(content) < settings.COMPRESSION_MIN_SIZE:
+                    continue
+                # Static files are compressed once, so use the maximum level.
+                compressed = compress(content, 'gzip', level=9)
+                if len(compressed) < len(content):
+                    with open(path + '.gz', 'wb') as target:
+                        target.write(compressed)
+                    written += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} precompressed files.'))
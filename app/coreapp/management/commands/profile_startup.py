@@ -0,0 +1,108 @@
+"""
+Report where process start-up time goes.
+
+Boots Django in a fresh interpreter with ``-X importtime`` the way a uWSGI
+worker does (settings, app registry, URLconf) and prints the slowest imports
+and the time spent in each ``AppConfig.ready``. Compare runs with and without
+``API_ONLY=1`` to see what the admin and docs cost; ``--package`` reports how
+many modules of a package were loaded at all.
+"""
+import json
+import os
+import subprocess
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+BOOT_SCRIPT = """
+import json, time
+from django.apps import AppConfig
+
+ready_times = {}
+create = AppConfig.create.__func__
+
+
+def timed_create(cls, entry):
+    config = create(cls, entry)
+    ready = config.ready
+
+    def timed_ready():
+        start = time.perf_counter()
+        ready()
+        ready_times[config.label] = time.perf_counter() - start
+
+    config.ready = timed_ready
+    return config
+
+
+AppConfig.create = classmethod(timed_create)
+
+phases = {}
+start = time.perf_counter()
+import django
+django.setup()
+phases['setup'] = time.perf_counter() - start
+
+start = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+phases['urlconf'] = time.perf_counter() - start
+
+print(json.dumps({'phases': phases, 'ready': ready_times}))
+"""
+
+
+def parse_importtime(output):
+    """Return ``(module, self_us, cumulative_us)`` rows from ``-X importtime`` output."""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        rows.append((module.rstrip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+class Command(BaseCommand):
+    help = 'Profile imports and AppConfig.ready() timings of a cold start.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=25, help='Number of imports to list.')
+        parser.add_argument('--sort', choices=['cumulative', 'self'], default='cumulative')
+        parser.add_argument('--package', action='append', default=[],
+                            help='Count the modules imported from this package (repeatable).')
+
+    def handle(self, *args, **options):
+        env = {**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'}
+        env.setdefault('DJANGO_SETTINGS_MODULE', 'ecommerce.settings')
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', BOOT_SCRIPT],
+            capture_output=True, text=True, env=env,
+        )
+        if result.returncode:
+            raise CommandError(f'Start-up failed:\n{result.stderr[-2000:]}')
+
+        timings = json.loads(result.stdout.strip().splitlines()[-1])
+        imports = parse_importtime(result.stderr)
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Phases'))
+        for phase, seconds in timings['phases'].items():
+            self.stdout.write(f'  {phase:<40} {seconds * 1000:9.1f} ms')
+
+        self.stdout.write(self.style.MIGRATE_HEADING('AppConfig.ready'))
+        for label, seconds in sorted(timings['ready'].items(), key=lambda item: -item[1]):
+            self.stdout.write(f'  {label:<40} {seconds * 1000:9.1f} ms')
+
+        column = 2 if options['sort'] == 'cumulative' else 1
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Slowest imports ({options["sort"]})'))
+        self.stdout.write(f'  {"module":<60} {"self":>9}    {"cumulative":>9}')
+        for module, self_us, cumulative_us in sorted(imports, key=lambda row: -row[column])[:options['limit']]:
+            self.stdout.write(f'  {module.strip():<60} {self_us / 1000:6.1f} ms {cumulative_us / 1000:9.1f} ms')
+        if options['package']:
+            self.stdout.write(self.style.MIGRATE_HEADING('Packages'))
+        for package in options['package']:
+            loaded = [row for row in imports if row[0].strip() == package or row[0].strip().startswith(package + '.')]
+            self_ms = sum(row[1] for row in loaded) / 1000
+            self.stdout.write(f'  {package:<40} {len(loaded):4} modules {self_ms:9.1f} ms')
+        total = sum(row[1] for row in imports)
+        self.stdout.write(f'{len(imports)} modules imported in {total / 1000:.1f} ms.')
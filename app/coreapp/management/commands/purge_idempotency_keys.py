@@ -0,0 +1,21 @@
+"""
+Delete idempotency keys whose replay window has passed.
+
+Expired keys are harmless (a retry that brings one back reuses its row), so
+this only keeps the ``IdempotencyKey`` table from growing with every keyed
+request; run it daily or so.
+"""
+from django.core.management.base import BaseCommand
+
+from ecommerce.idempotency import DEFAULT_BATCH_SIZE, purge_expired
+
+
+class Command(BaseCommand):
+    help = 'Delete expired Idempotency-Key records in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        deleted = purge_expired(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired idempotency keys.'))
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:34
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coreapp', '0003_rename_features_rent_location'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='rent',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='rent_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='rent',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['location'], name='rent_location_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coreapp', '0004_rent_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rent',
+            index=models.Index(fields=['updated_at'], name='rent_updated_at_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('coreapp', '0005_rent_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['is_staff', 'id'], name='user_is_staff_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['is_active', 'id'], name='user_is_active_id_idx'),
+        ),
+    ]
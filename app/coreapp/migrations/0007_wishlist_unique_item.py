@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:44
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_wishlist_items(apps, schema_editor):
+    """Keep the oldest row of each (user, property) pair before adding the constraint."""
+    Wishlist = apps.get_model('coreapp', 'Wishlist')
+    duplicates = (
+        Wishlist.objects.values('user_id', 'property_id')
+        .annotate(keep=Min('id'), total=Count('id'))
+        .filter(total__gt=1)
+    )
+    for row in duplicates:
+        Wishlist.objects.filter(
+            user_id=row['user_id'], property_id=row['property_id'],
+        ).exclude(id=row['keep']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coreapp', '0006_user_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_wishlist_items, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='wishlist',
+            constraint=models.UniqueConstraint(fields=('user', 'property'), name='unique_wishlist_item'),
+        ),
+    ]
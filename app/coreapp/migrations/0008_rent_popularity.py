@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coreapp', '0007_wishlist_unique_item'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PopularityEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weight', models.FloatField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='rent',
+            name='last_engaged_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='rent',
+            name='popularity',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='rent',
+            index=models.Index(fields=['-popularity', '-id'], name='rent_popularity_idx'),
+        ),
+        migrations.AddField(
+            model_name='popularityevent',
+            name='rent',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='coreapp.rent'),
+        ),
+    ]
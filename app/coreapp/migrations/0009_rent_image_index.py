@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coreapp', '0008_rent_popularity'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rent',
+            index=models.Index(fields=['image'], name='rent_image_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coreapp', '0010_changelog'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contact',
+            name='idempotency_key',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, unique=True),
+        ),
+    ]
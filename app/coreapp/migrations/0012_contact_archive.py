@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:53
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coreapp', '0011_contact_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContactArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('message', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('idempotency_key', models.CharField(blank=True, max_length=64, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['created_at'], name='contact_created_at_brin'),
+        ),
+        migrations.AddField(
+            model_name='contactarchive',
+            name='rent',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, to='coreapp.rent'),
+        ),
+        migrations.AddIndex(
+            model_name='contactarchive',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['created_at'], name='contactarchive_created_brin'),
+        ),
+    ]
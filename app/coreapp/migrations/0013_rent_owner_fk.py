@@ -0,0 +1,60 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_owner(apps, schema_editor):
+    """Point each listing at the user whose email (or username) was stored as its owner."""
+    Rent = apps.get_model('coreapp', 'Rent')
+    User = apps.get_model('coreapp', 'User')
+    Rent.objects.update(owner_user=Coalesce(
+        Subquery(User.objects.filter(email=OuterRef('owner')).values('id')[:1]),
+        Subquery(User.objects.filter(username=OuterRef('owner')).values('id')[:1]),
+    ))
+
+
+def restore_owner(apps, schema_editor):
+    """Write the owner's email back into the text column."""
+    Rent = apps.get_model('coreapp', 'Rent')
+    User = apps.get_model('coreapp', 'User')
+    Rent.objects.update(owner=Coalesce(
+        Subquery(User.objects.filter(id=OuterRef('owner_user')).values('email')[:1]),
+        models.Value(''),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coreapp', '0012_contact_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rent',
+            name='owner_user',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='listings', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(backfill_owner, restore_owner),
+        # Give the text column a default so the removal below can be reversed.
+        migrations.AlterField(
+            model_name='rent',
+            name='owner',
+            field=models.CharField(default='', max_length=255),
+        ),
+        migrations.RemoveField(
+            model_name='rent',
+            name='owner',
+        ),
+        migrations.RenameField(
+            model_name='rent',
+            old_name='owner_user',
+            new_name='owner',
+        ),
+        migrations.AddIndex(
+            model_name='rent',
+            index=models.Index(fields=['owner', '-created_at'], name='rent_owner_created_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:59
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coreapp', '0014_reportjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RentNeighbors',
+            fields=[
+                ('rent', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='neighbors', serialize=False, to='coreapp.rent')),
+                ('neighbor_ids', django.contrib.postgres.fields.ArrayField(base_field=models.BigIntegerField(), default=list, size=None)),
+                ('source_updated_at', models.DateTimeField()),
+                ('built_at', models.DateTimeField()),
+            ],
+        ),
+    ]
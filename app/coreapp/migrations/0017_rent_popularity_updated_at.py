@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coreapp', '0016_saved_searches'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rent',
+            name='popularity_updated_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='rent',
+            index=models.Index(fields=['popularity_updated_at'], name='rent_popularity_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coreapp', '0017_rent_popularity_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='changelog',
+            name='object_id',
+            field=models.PositiveBigIntegerField(),
+        ),
+    ]
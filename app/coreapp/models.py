@@ -1,7 +1,10 @@
 import uuid
 import os
 from django.db import models
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import BrinIndex, GinIndex
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MinLengthValidator
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
 
@@ -68,6 +71,12 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username']
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['is_staff', 'id'], name='user_is_staff_id_idx'),
+            models.Index(fields=['is_active', 'id'], name='user_is_active_id_idx'),
+        ]
+
     def __str__(self):
         return self.email
 
@@ -77,7 +86,8 @@ class Rent(models.Model):
     name = models.CharField(max_length=255)
     description = models.TextField()
     price = models.DecimalField(max_digits=10, decimal_places=2)
-    owner = models.CharField(max_length=255)
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+                              related_name='listings', db_index=False)
     location = models.TextField()
     property_type = models.CharField(max_length=100)
     contact_number = models.CharField(max_length=15)
@@ -90,6 +100,22 @@ class Rent(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
     image = models.ImageField(upload_to=upload_property_image, null=True, blank=True)
+    popularity = models.FloatField(default=0, editable=False)
+    last_engaged_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # When refresh_popularity last changed the score; the ETags of responses
+    # ranked by popularity read the latest value.
+    popularity_updated_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['name'], name='rent_name_trgm', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['location'], name='rent_location_trgm', opclasses=['gin_trgm_ops']),
+            models.Index(fields=['updated_at'], name='rent_updated_at_idx'),
+            models.Index(fields=['-popularity', '-id'], name='rent_popularity_idx'),
+            models.Index(fields=['popularity_updated_at'], name='rent_popularity_updated_idx'),
+            models.Index(fields=['image'], name='rent_image_idx'),
+            models.Index(fields=['owner', '-created_at'], name='rent_owner_created_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -102,14 +128,48 @@ class Wishlist(models.Model):
     property = models.ForeignKey(Rent, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'property'], name='unique_wishlist_item'),
+        ]
+
     def __str__(self):
         return f"{self.user.username}'s wishlist"if self.user else "Wishlist"
+
+
+class RentNeighbors(models.Model):
+    """Precomputed most similar listings, built by `manage.py build_neighbors`."""
+    rent = models.OneToOneField(Rent, on_delete=models.CASCADE, primary_key=True, related_name='neighbors')
+    neighbor_ids = ArrayField(models.BigIntegerField(), default=list)
+    source_updated_at = models.DateTimeField()
+    built_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.rent_id}: {self.neighbor_ids}"
+
+
+class PopularityEvent(models.Model):
+    """Engagement with a listing waiting to be folded into its popularity."""
+    rent = models.ForeignKey(Rent, on_delete=models.CASCADE)
+    weight = models.FloatField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.rent_id}: {self.weight}"
     
 class Contact(models.Model):
     """Model for contact form."""
     rent = models.ForeignKey(Rent, on_delete=models.CASCADE, null=True, blank=True)
     message = models.TextField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    idempotency_key = models.CharField(max_length=64, null=True, blank=True, unique=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Rows arrive in created_at order, so a BRIN index stays tiny and
+            # still lets date-range filters and archival skip old blocks.
+            BrinIndex(fields=['created_at'], name='contact_created_at_brin'),
+        ]
     
 
     def __str__(self):
@@ -125,4 +185,117 @@ class Contact(models.Model):
         return {
             'contact_number': None,
             'contact_email': None
-        }
\ No newline at end of file
+        }
+
+
+class ContactArchive(models.Model):
+    """Contact messages moved out of the hot table by `manage.py archive_contacts`."""
+    id = models.BigIntegerField(primary_key=True)
+    rent = models.ForeignKey(Rent, on_delete=models.DO_NOTHING, db_constraint=False, null=True, blank=True)
+    message = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField()
+    idempotency_key = models.CharField(max_length=64, null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            BrinIndex(fields=['created_at'], name='contactarchive_created_brin'),
+        ]
+
+    def __str__(self):
+        return self.message or ''
+
+
+class ChangeLog(models.Model):
+    """Append-only record of catalog changes for incremental sync."""
+    UPSERT = 'upsert'
+    DELETE = 'delete'
+    ACTION_CHOICES = [(UPSERT, 'Upsert'), (DELETE, 'Delete')]
+
+    id = models.BigAutoField(primary_key=True)
+    model = models.CharField(max_length=20)
+    object_id = models.PositiveBigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['model', 'id'], name='changelog_model_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.action} {self.model} {self.object_id}"
+
+
+class IdempotencyKey(models.Model):
+    """A request's Idempotency-Key and, once the request has finished, its response."""
+    key = models.CharField(max_length=64, unique=True)
+    fingerprint = models.CharField(max_length=32)
+    # Null while the first request with this key is still in progress.
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['expires_at'], name='idempotencykey_expires_idx'),
+        ]
+
+    def __str__(self):
+        return self.key
+
+
+class ReportJob(models.Model):
+    """An export requested by an admin and generated in the background."""
+    KINDS = [('users', 'Users'), ('listings', 'Listings'), ('wishlist', 'Wishlist saves'), ('contacts', 'Contact messages')]
+    FORMATS = [('csv', 'CSV'), ('xlsx', 'Excel')]
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = [(PENDING, 'Pending'), (RUNNING, 'Running'), (DONE, 'Done'), (FAILED, 'Failed')]
+
+    requested_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    kind = models.CharField(max_length=20, choices=KINDS)
+    format = models.CharField(max_length=10, choices=FORMATS, default='csv')
+    status = models.CharField(max_length=10, choices=STATUSES, default=PENDING)
+    file = models.FileField(upload_to='reports/', null=True, blank=True)
+    row_count = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.kind}.{self.format} ({self.status})"
+
+
+class SavedSearch(models.Model):
+    """A listing search a user wants to be notified about."""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='saved_searches')
+    name = models.CharField(max_length=100)
+    query = models.CharField(max_length=255, blank=True)
+    filters = models.JSONField(default=dict, blank=True)
+    # ChangeLog id up to which listings have been matched against this search.
+    last_change_id = models.BigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
+
+class SavedSearchMatch(models.Model):
+    """A listing that matched a saved search, shown in the user's inbox."""
+    search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name='matches')
+    rent = models.ForeignKey(Rent, on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
+    read_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['search', 'rent'], name='unique_saved_search_match'),
+        ]
+
+    def __str__(self):
+        return f"{self.search_id}: {self.rent_id}"
@@ -0,0 +1,37 @@
+"""
+Paginator for admin changelists over large tables.
+"""
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+def estimated_row_count(queryset):
+    """Return PostgreSQL's row estimate for the queryset's table, or None."""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    table = connection.ops.quote_name(queryset.model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [table])
+        row = cursor.fetchone()
+    # -1 means the table has never been analyzed.
+    return row[0] if row and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Use ``pg_class.reltuples`` instead of ``COUNT(*)`` for unfiltered tables.
+
+    Filtered querysets, and tables estimated below ``exact_count_below`` rows,
+    are still counted exactly.
+    """
+    exact_count_below = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimated_row_count(queryset)
+            if estimate is not None and estimate >= self.exact_count_below:
+                return estimate
+        return super().count
@@ -0,0 +1,25 @@
+"""
+System checks for the e-commerce project.
+"""
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Warn when production would run with a cache private to each process."""
+    if settings.CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHES:
+        return []
+    return [
+        Warning(
+            'The default cache is local to each process.',
+            hint='Set REDIS_URL: invalidations, revocations and replica '
+                 'pins written by one worker are otherwise invisible to the others.',
+            id='ecommerce.W001',
+        )
+    ]
@@ -0,0 +1,55 @@
+"""
+Response compression helpers shared by the middleware and the benchmark.
+"""
+import gzip
+import re
+
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+_coding_re = re.compile(r'\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?\s*')
+
+
+def available_encodings():
+    """Return the encodings this server can produce, preferred first."""
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def accepted_encodings(header):
+    """Return the encodings a client accepts, mapped to their q-values."""
+    accepted = {}
+    for part in header.split(','):
+        match = _coding_re.fullmatch(part)
+        if match:
+            accepted[match.group(1).lower()] = float(match.group(2) or 1)
+    return accepted
+
+
+def choose_encoding(header):
+    """Pick the best encoding for an Accept-Encoding header, or None."""
+    accepted = accepted_encodings(header)
+    candidates = [
+        (accepted.get(coding, accepted.get('*', 0)), -rank, coding)
+        for rank, coding in enumerate(available_encodings())
+    ]
+    quality, _, coding = max(candidates)
+    return coding if quality > 0 else None
+
+
+def compress(content, encoding, level=None):
+    """Compress bytes with the given encoding."""
+    if encoding == 'br':
+        quality = settings.COMPRESSION_BROTLI_QUALITY if level is None else level
+        return brotli.compress(content, quality=quality)
+    compresslevel = settings.COMPRESSION_GZIP_LEVEL if level is None else level
+    return gzip.compress(content, compresslevel=compresslevel, mtime=0)
+
+
+def is_compressible(content_type):
+    """Return True if responses of this content type should be compressed."""
+    media_type = content_type.split(';', 1)[0].strip().lower()
+    return media_type in settings.COMPRESSION_CONTENT_TYPES
@@ -0,0 +1,145 @@
+"""
+``Idempotency-Key`` support for write endpoints.
+
+Keys live in the ``IdempotencyKey`` table, whose unique ``key`` column lets
+exactly one request claim a key across all workers. The first response for a
+key is stored for ``IDEMPOTENCY_KEY_TTL`` seconds; a retry with the same key
+and body gets that response back without running the view again. Expired rows
+are reused when their key comes back and deleted by
+``manage.py purge_idempotency_keys``.
+"""
+import functools
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models.signals import post_save
+from django.http.request import RawPostDataException
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from coreapp.models import IdempotencyKey
+
+HEADER = 'HTTP_IDEMPOTENCY_KEY'
+MAX_KEY_LENGTH = 255
+# A claim older than this is taken to belong to a request that died.
+PENDING_TIMEOUT = 30
+DEFAULT_BATCH_SIZE = 5000
+
+
+def idempotency_key(request):
+    """Return a digest of the request's Idempotency-Key scoped to path and user, or None."""
+    key = request.META.get(HEADER, '').strip()
+    if not key:
+        return None
+    if len(key) > MAX_KEY_LENGTH:
+        raise ValidationError({'Idempotency-Key': f'Must be at most {MAX_KEY_LENGTH} characters.'})
+    user_id = request.user.id if request.user.is_authenticated else 'anon'
+    return hashlib.sha256(f'{request.path}:{user_id}:{key}'.encode()).hexdigest()
+
+
+def _fingerprint(request):
+    """Return a digest of the request body so a reused key with other data is caught."""
+    try:
+        body = request.body
+    except RawPostDataException:
+        body = repr(request.data).encode()
+    return hashlib.md5(body).hexdigest()
+
+
+def _claim(digest, fingerprint):
+    """Claim ``digest`` for this request.
+
+    Returns ``(record, claimed)``; when the key is already held, ``record`` is
+    the row that holds it.
+    """
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=PENDING_TIMEOUT)
+    record, created = create_once(
+        IdempotencyKey(key=digest, fingerprint=fingerprint, expires_at=expires_at), key=digest)
+    if created:
+        return record, True
+    if record.expires_at > now:
+        return record, False
+    # The row is expired: a finished response past its TTL, or a claim whose
+    # request died. Take it over unless another retry got there first.
+    taken = IdempotencyKey.objects.filter(pk=record.pk, expires_at=record.expires_at).update(
+        fingerprint=fingerprint, status_code=None, response=None, created_at=now, expires_at=expires_at)
+    if not taken:
+        record.refresh_from_db()
+    return record, bool(taken)
+
+
+def idempotent(view_method):
+    """Replay the stored response when a request repeats its Idempotency-Key.
+
+    Concurrent duplicates get 409 while the first is in flight, and reusing a
+    key with a different body gets 422. Server errors and errors raised as
+    exceptions (e.g. validation) are not stored, so fixing them is a new try.
+    """
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        digest = idempotency_key(request)
+        if digest is None:
+            return view_method(self, request, *args, **kwargs)
+
+        fingerprint = _fingerprint(request)
+        record, claimed = _claim(digest, fingerprint)
+        if not claimed:
+            if record.fingerprint != fingerprint:
+                return Response({'detail': 'Idempotency-Key was already used with a different request.'},
+                                status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+            if record.status_code is None:
+                return Response({'detail': 'A request with this Idempotency-Key is in progress.'},
+                                status=status.HTTP_409_CONFLICT)
+            response = Response(record.response, status=record.status_code)
+            response['Idempotent-Replayed'] = 'true'
+            return response
+
+        claim = IdempotencyKey.objects.filter(pk=record.pk, status_code__isnull=True)
+        request.idempotency_key = digest
+        try:
+            response = view_method(self, request, *args, **kwargs)
+        except Exception:
+            claim.delete()
+            raise
+        if response.status_code < 500:
+            claim.update(status_code=response.status_code, response=response.data,
+                         expires_at=timezone.now() + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL))
+        else:
+            claim.delete()
+        return response
+
+    return wrapper
+
+
+def purge_expired(batch_size=DEFAULT_BATCH_SIZE):
+    """Delete expired idempotency keys in batches and return how many were deleted."""
+    now = timezone.now()
+    deleted = 0
+    while True:
+        ids = list(IdempotencyKey.objects.filter(expires_at__lte=now).values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+        deleted += IdempotencyKey.objects.filter(id__in=ids, expires_at__lte=now).delete()[0]
+        if len(ids) < batch_size:
+            break
+    return deleted
+
+
+def create_once(instance, **lookup):
+    """Insert ``instance`` with ON CONFLICT DO NOTHING and return ``(row, created)``.
+
+    ``lookup`` must identify the row by a unique constraint. The row was
+    created by this call when its ``created_at`` is the one just assigned;
+    ``post_save`` is sent in that case because ``bulk_create`` skips it.
+    """
+    model = type(instance)
+    model.objects.bulk_create([instance], ignore_conflicts=True)
+    row = model.objects.get(**lookup)
+    created = row.created_at == instance.created_at
+    if created:
+        post_save.send(sender=model, instance=row, created=True, update_fields=None, raw=False, using=row._state.db)
+    return row, created
@@ -0,0 +1,63 @@
+"""
+Authorized serving of uploaded media.
+
+Django decides whether an image may be shown and which cache headers apply;
+in ``accel`` mode nginx then streams the file through ``X-Accel-Redirect``
+so workers never hold the bytes.
+"""
+import mimetypes
+import os
+import posixpath
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import patch_cache_control
+from django.views.static import serve
+
+from coreapp.models import Rent
+
+
+def listing_image_state(path):
+    """Return whether the listing using ``path`` is active, or None if no listing does."""
+    return Rent.objects.filter(image=path).values_list('is_active', flat=True).first()
+
+
+def serve_media(request, path):
+    """Serve an uploaded file after checking the listing it belongs to."""
+    path = posixpath.normpath(path).lstrip('/')
+    is_active = None if path.startswith('..') else listing_image_state(path)
+    is_admin = request.user.is_staff or getattr(request.user, 'is_admin_user', False)
+    if is_active is None or not (is_active or is_admin):
+        raise Http404('Media not found.')
+
+    if settings.MEDIA_SERVE_MODE == 'accel':
+        content_type, _ = mimetypes.guess_type(path)
+        response = HttpResponse(content_type=content_type or 'application/octet-stream')
+        response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_PREFIX + quote(path)
+    else:
+        response = serve(request, path, document_root=settings.MEDIA_ROOT)
+
+    # Uploads get a fresh uuid name (see upload_property_image), so a URL
+    # never changes content and public copies can be cached for good.
+    if is_active:
+        patch_cache_control(response, public=True, max_age=settings.MEDIA_CACHE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def send_media_file(path, filename):
+    """Return a file under MEDIA_ROOT as a download, through nginx when available."""
+    if settings.MEDIA_SERVE_MODE == 'accel':
+        content_type, _ = mimetypes.guess_type(filename)
+        response = HttpResponse(content_type=content_type or 'application/octet-stream')
+        response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_PREFIX + quote(path)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    else:
+        full_path = os.path.join(settings.MEDIA_ROOT, path)
+        if not os.path.isfile(full_path):
+            raise Http404('File not found.')
+        response = FileResponse(open(full_path, 'rb'), as_attachment=True, filename=filename)
+    patch_cache_control(response, private=True, no_store=True)
+    return response
@@ -0,0 +1,156 @@
+"""
+Project-wide middleware for the e-commerce API.
+"""
+import hashlib
+import logging
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.utils.cache import patch_vary_headers
+
+from ecommerce.compression import choose_encoding, compress, is_compressible
+from ecommerce.querybudget import QueryBudgetExceeded, budget_for, budget_report, counts_toward_budget
+from ecommerce.routers import read_from
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+def replica_lag():
+    """Return the replica's replication lag in seconds, cached briefly."""
+    lag = cache.get('replica_lag')
+    if lag is None:
+        try:
+            with connections[settings.REPLICA_DATABASE].cursor() as cursor:
+                cursor.execute(REPLICA_LAG_SQL)
+                lag = float(cursor.fetchone()[0])
+        except DatabaseError as e:
+            logger.warning("Replica lag check failed: %s", e)
+            lag = float('inf')
+        cache.set('replica_lag', lag, settings.REPLICA_LAG_CHECK_SECONDS)
+    return lag
+
+
+class ReplicaRoutingMiddleware:
+    """Serve safe requests from the read replica when it is safe to do so.
+
+    After a client writes, its reads stay on the primary for
+    ``REPLICA_PIN_SECONDS`` so it always sees its own changes. Reads also
+    fall back to the primary while the replica lags too far behind.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        pin_key = self._pin_key(request)
+        alias = DEFAULT_DB_ALIAS
+        if (
+            settings.REPLICA_DATABASE in settings.DATABASES
+            and request.method in SAFE_METHODS
+            and not cache.get(pin_key)
+            and replica_lag() <= settings.REPLICA_MAX_LAG_SECONDS
+        ):
+            alias = settings.REPLICA_DATABASE
+
+        with read_from(alias):
+            response = self.get_response(request)
+
+        if request.method not in SAFE_METHODS:
+            cache.set(pin_key, True, settings.REPLICA_PIN_SECONDS)
+        return response
+
+    def _pin_key(self, request):
+        # JWT authentication runs inside the view, so clients are told apart
+        # by their bearer token, or by address when anonymous.
+        client = request.META.get('HTTP_AUTHORIZATION') or request.META.get('REMOTE_ADDR', '')
+        return 'db_pin_' + hashlib.md5(client.encode()).hexdigest()
+
+
+class CompressionMiddleware:
+    """Compress API responses with Brotli or gzip.
+
+    Only content types listed in ``COMPRESSION_CONTENT_TYPES`` and bodies of
+    at least ``COMPRESSION_MIN_SIZE`` bytes are compressed; HTML is left
+    alone so CSRF tokens in admin pages are not exposed to BREACH.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            response.streaming
+            or response.has_header('Content-Encoding')
+            or not is_compressible(response.get('Content-Type', ''))
+            or len(response.content) < settings.COMPRESSION_MIN_SIZE
+        ):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        compressed = compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+
+        # The body changed, so a strong ETag has to become weak (RFC 9110 8.8.1).
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
+
+
+class QueryBudgetMiddleware:
+    """Count each request's queries and check them against the view's budget.
+
+    With ``QUERY_BUDGET_MODE = 'log'`` violations are logged, with ``'raise'``
+    they fail the request (for CI); any other value removes the middleware.
+    """
+
+    def __init__(self, get_response):
+        if settings.QUERY_BUDGET_MODE not in ('log', 'raise'):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = []
+
+        def record(execute, sql, params, many, context):
+            if counts_toward_budget(sql):
+                queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(record))
+            response = self.get_response(request)
+
+        response['X-Query-Count'] = str(len(queries))
+        budget = getattr(request, 'query_budget', None)
+        if budget is not None and len(queries) > budget:
+            report = budget_report(request.get_full_path(), budget, queries)
+            if settings.QUERY_BUDGET_MODE == 'raise':
+                raise QueryBudgetExceeded(report)
+            logger.warning(report)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = budget_for(view_func, request.method)
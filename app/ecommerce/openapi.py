@@ -0,0 +1,20 @@
+"""
+OpenAPI annotations for views and serializers.
+
+API-only workers (``API_ONLY=1``) never generate or serve the schema, so there
+the annotations are no-ops and drf-spectacular is not imported at all; every
+other process gets drf-spectacular's own decorators.
+"""
+from types import SimpleNamespace
+
+from django.conf import settings
+
+if settings.API_ONLY:
+    def _annotation(*args, **kwargs):
+        return lambda target: target
+
+    extend_schema = extend_schema_field = extend_schema_serializer = _annotation
+    OpenApiTypes = SimpleNamespace(OBJECT=None, BINARY=None)
+else:
+    from drf_spectacular.types import OpenApiTypes  # noqa: F401
+    from drf_spectacular.utils import extend_schema, extend_schema_field, extend_schema_serializer  # noqa: F401
@@ -0,0 +1,34 @@
+"""
+Request parsers matching the compact renderers.
+"""
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+
+from ecommerce.renderers import CompactJSONRenderer, MessagePackRenderer, msgpack, orjson
+
+
+class CompactJSONParser(parsers.JSONParser):
+    """JSON parser backed by orjson, falling back to DRF's parser."""
+    renderer_class = CompactJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+
+class MessagePackParser(parsers.BaseParser):
+    """Parse MessagePack request bodies."""
+    media_type = 'application/msgpack'
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if msgpack is None:
+            raise ParseError('MessagePack is not supported by this server.')
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError) as exc:
+            raise ParseError(f'MessagePack parse error - {exc}')
@@ -0,0 +1,67 @@
+"""
+Per-view query budgets.
+
+Views declare the most queries a request may run with ``query_budget`` (on
+the class, or on a single action). ``QueryBudgetMiddleware`` counts the
+queries and, depending on ``QUERY_BUDGET_MODE``, logs or raises when a request
+goes over, listing the SQL grouped by fingerprint so N+1 patterns stand out.
+"""
+import re
+from collections import Counter
+
+_in_list_re = re.compile(r'IN \((?:%s, )*%s\)')
+_literal_re = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+_space_re = re.compile(r'\s+')
+_savepoint_re = re.compile(r'\s*(?:RELEASE |ROLLBACK TO )?SAVEPOINT\b', re.IGNORECASE)
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised in ``raise`` mode when a request runs more queries than its budget."""
+
+
+def query_budget(limit):
+    """Declare the maximum number of queries for a view class or action."""
+    def decorator(view):
+        view.query_budget = limit
+        return view
+    return decorator
+
+
+def budget_for(view_func, method):
+    """Return the budget declared for the view handling ``method``, or None."""
+    cls = getattr(view_func, 'cls', None)
+    if cls is None:
+        return getattr(view_func, 'query_budget', None)
+    action = (getattr(view_func, 'actions', None) or {}).get(method.lower(), method.lower())
+    handler = getattr(cls, action, None)
+    return getattr(handler, 'query_budget', getattr(cls, 'query_budget', None))
+
+
+def counts_toward_budget(sql):
+    """Return whether ``sql`` is charged to the view.
+
+    Savepoints are left out: a view's ``atomic`` block only issues them when
+    it is nested, e.g. inside a test case's transaction, so counting them
+    would make the same request cost more under test than in production.
+    """
+    return not _savepoint_re.match(sql)
+
+
+def fingerprint(sql):
+    """Normalize SQL so queries differing only in parameters compare equal."""
+    sql = _in_list_re.sub('IN (...)', sql)
+    sql = _literal_re.sub('?', sql)
+    return _space_re.sub(' ', sql).strip()
+
+
+def budget_report(path, budget, queries):
+    """Describe a budget violation with repeated fingerprints first."""
+    counts = Counter(fingerprint(sql) for sql in queries)
+    lines = [f'{path} ran {len(queries)} queries, budget is {budget}.']
+    repeated = [(sql, count) for sql, count in counts.most_common() if count > 1]
+    if repeated:
+        lines.append('Repeated queries:')
+        lines += [f'  {count}x {sql}' for sql, count in repeated]
+    lines.append('All queries:')
+    lines += [f'  {number}. {sql}' for number, sql in enumerate(queries, 1)]
+    return '\n'.join(lines)
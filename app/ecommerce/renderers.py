@@ -0,0 +1,53 @@
+"""
+Compact response renderers for the API.
+"""
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+_encoder = JSONEncoder()
+
+
+def _default(obj):
+    """Encode the types DRF's JSON encoder knows about (Decimal, lazy strings, ...)."""
+    return _encoder.default(obj)
+
+
+class CompactJSONRenderer(renderers.JSONRenderer):
+    """JSON renderer backed by orjson.
+
+    Falls back to DRF's renderer for indented (browsable) output or when
+    orjson is not installed.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    """Render responses as MessagePack for clients that ask for it."""
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if msgpack is None:
+            raise ImproperlyConfigured('MessagePackRenderer requires the msgpack package.')
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_default, use_bin_type=True)
@@ -0,0 +1,39 @@
+"""
+Database routing between the primary and an optional read replica.
+
+Reads go to whichever alias the current request selected (see
+``ReplicaRoutingMiddleware``); writes and migrations always use the primary.
+Outside a request everything reads from the primary.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import DEFAULT_DB_ALIAS
+
+_read_alias = ContextVar('read_alias', default=DEFAULT_DB_ALIAS)
+
+
+@contextmanager
+def read_from(alias):
+    """Route ORM reads inside the block to the given database alias."""
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class ReplicaRouter:
+    """Send reads to the selected alias and everything else to the primary."""
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
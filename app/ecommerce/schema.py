@@ -0,0 +1,111 @@
+"""
+Prebuilt OpenAPI schema.
+
+Generating the schema introspects every view and serializer, so it is built
+once (``manage.py build_schema`` at deploy, or on the first request) and
+written to ``OPENAPI_SCHEMA_DIR`` with gzip and Brotli copies. The view serves
+those bytes from memory with an ETag.
+"""
+import hashlib
+import os
+import threading
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import quote_etag
+from django.views import View
+
+from ecommerce.compression import available_encodings, choose_encoding, compress
+
+SCHEMA_FORMATS = {
+    'yaml': ('schema.yaml', 'application/vnd.oai.openapi'),
+    'json': ('schema.json', 'application/vnd.oai.openapi+json'),
+}
+SUFFIXES = {'gzip': '.gz', 'br': '.br'}
+
+_lock = threading.Lock()
+_loaded = {}
+
+
+def schema_path(fmt, encoding=None):
+    """Return the file holding a format of the schema, optionally compressed."""
+    filename = SCHEMA_FORMATS[fmt][0] + (SUFFIXES[encoding] if encoding else '')
+    return os.path.join(settings.OPENAPI_SCHEMA_DIR, filename)
+
+
+def _write(path, content):
+    """Replace a file atomically so readers never see a partial schema."""
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as target:
+        target.write(content)
+    os.replace(temporary, path)
+
+
+def build_schema():
+    """Generate the schema in every format and write it with compressed copies."""
+    from drf_spectacular.generators import SchemaGenerator
+    from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+
+    schema = SchemaGenerator().get_schema(request=None, public=True)
+    rendered = {
+        'yaml': OpenApiYamlRenderer().render(schema, renderer_context={}),
+        'json': OpenApiJsonRenderer().render(schema, renderer_context={}),
+    }
+    os.makedirs(settings.OPENAPI_SCHEMA_DIR, exist_ok=True)
+    for fmt, content in rendered.items():
+        for encoding in available_encodings():
+            _write(schema_path(fmt, encoding), compress(content, encoding, level=11 if encoding == 'br' else 9))
+        _write(schema_path(fmt), content)
+    _loaded.clear()
+    return rendered
+
+
+def load_schema(fmt):
+    """Return ``(etag, {encoding: bytes})`` for a format, building it if needed."""
+    path = schema_path(fmt)
+    mtime = os.path.getmtime(path) if os.path.exists(path) else None
+    cached = _loaded.get(fmt)
+    if cached is not None and cached[0] == mtime:
+        return cached[1], cached[2]
+
+    with _lock:
+        if not os.path.exists(path):
+            build_schema()
+        mtime = os.path.getmtime(path)
+        variants = {}
+        for encoding in [None, *available_encodings()]:
+            if os.path.exists(schema_path(fmt, encoding)):
+                with open(schema_path(fmt, encoding), 'rb') as source:
+                    variants[encoding] = source.read()
+        etag = hashlib.sha256(variants[None]).hexdigest()[:32]
+        _loaded[fmt] = (mtime, etag, variants)
+    return etag, variants
+
+
+class CachedSchemaView(View):
+    """Serve the prebuilt OpenAPI schema as YAML, or JSON with ?format=json."""
+    cache_max_age = 60 * 10
+
+    def get(self, request):
+        accept = request.META.get('HTTP_ACCEPT', '')
+        fmt = request.GET.get('format') or ('json' if 'json' in accept else 'yaml')
+        if fmt not in SCHEMA_FORMATS:
+            fmt = 'yaml'
+        digest, variants = load_schema(fmt)
+
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding not in variants:
+            encoding = None
+        # Each encoding is a different representation, so it gets its own ETag.
+        etag = quote_etag(f'{digest}-{encoding}' if encoding else digest)
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(variants[encoding], content_type=SCHEMA_FORMATS[fmt][1])
+            if encoding:
+                response['Content-Encoding'] = encoding
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=self.cache_max_age)
+        patch_vary_headers(response, ['Accept', 'Accept-Encoding'])
+        return response
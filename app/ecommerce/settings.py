@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+import sys
 from pathlib import Path
 from datetime import timedelta
 
@@ -25,7 +26,9 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = os.environ.get('SECRET_KEY', 'changeme')
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG =  'True'
+DEBUG = os.environ.get('DEBUG', '0').lower() in ('1', 'true', 'yes')
+
+TESTING = sys.argv[1:2] == ['test']
 
 
 ALLOWED_HOSTS = os.environ.get('ALLOWED_HOSTS', '127.0.0.1,localhost,e-commerce-1-pdsc.onrender.com').split(',')
@@ -66,6 +69,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'drf_spectacular',
     'rest_framework',
     'rest_framework_simplejwt.token_blacklist',
@@ -78,8 +82,21 @@ INSTALLED_APPS = [
     'corsheaders',
 ]
 
+# API-only worker processes skip the admin site and the OpenAPI docs, which
+# are served by a separate process: no ModelAdmins are registered and
+# drf-spectacular is never imported (see ecommerce/openapi.py). DRF itself
+# still imports part of django.contrib.admin (rest_framework.schemas loads
+# admindocs), so check the savings with ``profile_startup --package``.
+API_ONLY = os.environ.get('API_ONLY', '0').lower() in ('1', 'true', 'yes')
+if API_ONLY:
+    INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in ('django.contrib.admin', 'drf_spectacular')]
+
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'ecommerce.middleware.CompressionMiddleware',
+    'ecommerce.middleware.ReplicaRoutingMiddleware',
+    # After replica routing, so its lag probe is not charged to the view.
+    'ecommerce.middleware.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -123,6 +140,47 @@ DATABASES = {
     }
 }
 
+# Optional read replica for safe (GET/HEAD/OPTIONS) requests; None disables
+# replica reads. The test suite always gets a 'replica' alias mirroring the
+# default database, which the routing tests enable with override_settings.
+REPLICA_DATABASE = None
+if TESTING:
+    DATABASES['replica'] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+elif os.environ.get('DB_REPLICA_HOST'):
+    REPLICA_DATABASE = 'replica'
+    DATABASES[REPLICA_DATABASE] = {
+        **DATABASES['default'],
+        'HOST': os.environ.get('DB_REPLICA_HOST'),
+        'PORT': os.environ.get('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+    }
+
+DATABASE_ROUTERS = ['ecommerce.routers.ReplicaRouter']
+REPLICA_PIN_SECONDS = int(os.environ.get('DB_REPLICA_PIN_SECONDS', 5))
+REPLICA_MAX_LAG_SECONDS = float(os.environ.get('DB_REPLICA_MAX_LAG_SECONDS', 2))
+REPLICA_LAG_CHECK_SECONDS = 5
+
+
+# Cache shared by every worker and management command: listing documents,
+# invalidation versions, replica pins and revoked tokens must be seen by all
+# processes. The process-local fallback is only suitable for a single
+# development server.
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'ecommerce',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -161,8 +219,28 @@ USE_TZ = True
 STATIC_URL = '/static/'
 MEDIA_URL = '/media/'
 
-MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
-STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+MEDIA_ROOT = os.environ.get('MEDIA_ROOT', os.path.join(BASE_DIR, 'media'))
+
+# Uploaded media is authorized by ecommerce.media.serve_media. With 'accel'
+# the bytes are sent by nginx from its internal MEDIA_ACCEL_PREFIX location;
+# 'django' streams them from the worker for setups without the proxy.
+MEDIA_SERVE_MODE = os.environ.get('MEDIA_SERVE_MODE', 'django')
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+MEDIA_CACHE_MAX_AGE = 60 * 60 * 24 * 365
+# Deployments collect into the volume nginx serves as /static.
+STATIC_ROOT = os.environ.get('STATIC_ROOT', os.path.join(BASE_DIR, 'staticfiles'))
+
+# Response compression (see ecommerce.middleware.CompressionMiddleware).
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))
+COMPRESSION_CONTENT_TYPES = [
+    'application/json',
+    'application/msgpack',
+    'application/vnd.oai.openapi',
+    'application/vnd.oai.openapi+json',
+]
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 4
+COMPRESSION_STATIC_EXTENSIONS = ['.css', '.js', '.svg', '.json', '.txt', '.html', '.map']
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -176,6 +254,17 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
+    'DEFAULT_RENDERER_CLASSES': [
+        'ecommerce.renderers.CompactJSONRenderer',
+        'ecommerce.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'ecommerce.parsers.CompactJSONParser',
+        'ecommerce.parsers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_THROTTLE_CLASSES': [
         'rest_framework.throttling.AnonRateThrottle',
         'rest_framework.throttling.UserRateThrottle'
@@ -186,6 +275,23 @@ REST_FRAMEWORK = {
     },
 }
 
+# Per-view query budgets (see ecommerce.querybudget): 'log' or 'raise' on
+# violations, 'off' to skip counting. The test suite runs with 'raise'.
+QUERY_BUDGET_MODE = os.environ.get('QUERY_BUDGET_MODE', 'raise' if TESTING else 'log' if DEBUG else 'off')
+
+# Admin report exports (see property_admin.reports).
+REPORT_THREAD_WORKERS = int(os.environ.get('REPORT_THREAD_WORKERS', 2))
+REPORT_PROCESS_WORKERS = int(os.environ.get('REPORT_PROCESS_WORKERS', 2))
+REPORT_CHUNK_SIZE = 2000
+# Pending or running jobs older than this were lost with their worker.
+REPORT_STALE_SECONDS = int(os.environ.get('REPORT_STALE_SECONDS', 60 * 60))
+
+# How long responses to requests with an Idempotency-Key are replayed.
+IDEMPOTENCY_KEY_TTL = 60 * 60 * 24
+
+# Prebuilt OpenAPI schema (see ecommerce.schema and `manage.py build_schema`).
+OPENAPI_SCHEMA_DIR = os.environ.get('OPENAPI_SCHEMA_DIR', os.path.join(BASE_DIR, 'openapi'))
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Bel Space API',
     'COMPONENT_SPLIT_REQUEST': True,
@@ -203,4 +309,5 @@ SIMPLE_JWT = {
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
     'JTI_CLAIM': 'jti',
+    'TOKEN_REFRESH_SERIALIZER': 'user.serializers.TokenRefreshSerializer',
 }
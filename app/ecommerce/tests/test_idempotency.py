@@ -0,0 +1,75 @@
+"""
+Tests for Idempotency-Key handling on write endpoints.
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from coreapp.models import Contact, IdempotencyKey, Rent, User
+from ecommerce.idempotency import purge_expired
+
+MESSAGE_URL = '/api/property/message/'
+
+
+class IdempotencyKeyTests(TestCase):
+    """Retries with the same key replay the first response, across workers."""
+
+    def setUp(self):
+        cache.clear()
+        owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.rent = Rent.objects.create(
+            owner=owner, name='Flat', description='Flat', location='Lagos', price=100,
+            category='flat', bedrooms=1, bathrooms=1, is_active=True,
+        )
+
+    def post(self, message='Hi', key='retry-1'):
+        return self.client.post(MESSAGE_URL, {'rent': self.rent.id, 'message': message},
+                                content_type='application/json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_stored_response(self):
+        first = self.post()
+        # The record is in the database, not a process-local cache.
+        cache.clear()
+        second = self.post()
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(Contact.objects.count(), 1)
+
+    def test_key_reused_with_other_body_is_rejected(self):
+        self.post()
+        response = self.post(message='Something else')
+        self.assertEqual(response.status_code, 422)
+
+    def test_request_in_progress_conflicts(self):
+        self.post()
+        IdempotencyKey.objects.update(status_code=None, response=None)
+        response = self.post()
+        self.assertEqual(response.status_code, 409)
+
+    def test_stale_claim_is_taken_over(self):
+        self.post()
+        IdempotencyKey.objects.update(status_code=None, response=None,
+                                      expires_at=timezone.now() - timedelta(seconds=1))
+        response = self.post()
+        # The contact row was created by the dead request; the retry finds it.
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(IdempotencyKey.objects.get().status_code, 200)
+        self.assertEqual(Contact.objects.count(), 1)
+
+    def test_validation_error_is_not_stored(self):
+        response = self.client.post(MESSAGE_URL, {'rent': 0}, content_type='application/json',
+                                    HTTP_IDEMPOTENCY_KEY='retry-1')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_purge_deletes_only_expired_keys(self):
+        self.post(key='old')
+        self.post(key='new')
+        IdempotencyKey.objects.filter(pk=IdempotencyKey.objects.earliest('id').pk).update(
+            expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(purge_expired(batch_size=1), 1)
+        self.assertEqual(IdempotencyKey.objects.count(), 1)
@@ -0,0 +1,99 @@
+"""
+Tests for routing reads between the primary and the read replica.
+"""
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from coreapp.models import Rent, User
+from ecommerce.middleware import replica_lag
+
+LIST_URL = '/api/property/list/'
+MESSAGE_URL = '/api/property/message/'
+
+
+@override_settings(REPLICA_DATABASE='replica', REPLICA_MAX_LAG_SECONDS=2)
+class ReplicaRoutingTests(TestCase):
+    """Safe requests read from the replica unless pinned or lagging."""
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        cache.clear()
+        owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.rent = Rent.objects.create(
+            owner=owner, name='Flat', description='Flat', location='Lagos', price=100,
+            category='flat', bedrooms=1, bathrooms=1, is_active=True,
+        )
+
+    def read_queries(self, path):
+        """GET ``path`` and return the query counts on the primary and the replica."""
+        with CaptureQueriesContext(connections['default']) as primary:
+            with CaptureQueriesContext(connections['replica']) as replica:
+                response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return len(primary), len(replica)
+
+    @mock.patch('ecommerce.middleware.replica_lag', return_value=0)
+    def test_safe_requests_read_from_replica(self, lag):
+        primary, replica = self.read_queries(LIST_URL)
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+    @mock.patch('ecommerce.middleware.replica_lag', return_value=0)
+    def test_write_pins_client_to_primary(self, lag):
+        response = self.client.post(MESSAGE_URL, {'rent': self.rent.id, 'message': 'Hi'},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        primary, replica = self.read_queries(LIST_URL)
+        self.assertEqual(replica, 0)
+        self.assertGreater(primary, 0)
+
+    @mock.patch('ecommerce.middleware.replica_lag', return_value=0)
+    def test_expired_pin_reads_from_replica(self, lag):
+        with override_settings(REPLICA_PIN_SECONDS=0):
+            self.client.post(MESSAGE_URL, {'rent': self.rent.id, 'message': 'Hi'}, content_type='application/json')
+        primary, replica = self.read_queries(LIST_URL)
+        self.assertEqual(primary, 0)
+
+    @mock.patch('ecommerce.middleware.replica_lag', return_value=0)
+    def test_pin_is_per_client(self, lag):
+        self.client.post(MESSAGE_URL, {'rent': self.rent.id, 'message': 'Hi'},
+                         content_type='application/json', REMOTE_ADDR='10.0.0.1')
+        primary, replica = self.read_queries(LIST_URL)
+        self.assertEqual(primary, 0)
+
+    @mock.patch('ecommerce.middleware.replica_lag', return_value=10)
+    def test_lagging_replica_falls_back_to_primary(self, lag):
+        primary, replica = self.read_queries(LIST_URL)
+        self.assertEqual(replica, 0)
+        self.assertGreater(primary, 0)
+
+    @override_settings(REPLICA_DATABASE=None)
+    def test_no_replica_reads_primary(self):
+        primary, replica = self.read_queries(LIST_URL)
+        self.assertEqual(replica, 0)
+        self.assertGreater(primary, 0)
+
+
+@override_settings(REPLICA_DATABASE='replica')
+class ReplicaLagTests(TestCase):
+    """The replica lag probe is cached and fails closed."""
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        cache.clear()
+
+    def test_lag_is_cached(self):
+        with CaptureQueriesContext(connections['replica']) as queries:
+            first = replica_lag()
+            second = replica_lag()
+        self.assertEqual(first, second)
+        self.assertEqual(len(queries), 1)
+
+    def test_failed_probe_counts_as_lagging(self):
+        with mock.patch.object(connections['replica'], 'cursor', side_effect=DatabaseError('down')):
+            self.assertEqual(replica_lag(), float('inf'))
+        self.assertEqual(cache.get('replica_lag'), float('inf'))
@@ -14,37 +14,38 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
-from django.urls import path, include
-from django.conf.urls.static import static
+from django.urls import path, re_path, include
 from django.conf import settings
 
-
-# Third-party imports
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularSwaggerView,
-)
+from ecommerce.media import serve_media
 
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
-
-     # API Documentation
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path(
-        'api/docs/',
-        SpectacularSwaggerView.as_view(url_name='schema'),
-        name='swagger-ui',
-    ),
     # API Endpoints
     path('api/user/', include('user.urls', namespace='user')),
     path('api/property/', include('property.urls', namespace='property')),
     path('api/property-admin/', include('property_admin.urls', namespace='property_admin')),
+
+    # Uploaded media
+    re_path(rf'^{settings.MEDIA_URL.lstrip("/")}(?P<path>.+)$', serve_media, name='media'),
 ]
 
-if settings.DEBUG:
-    urlpatterns += static(
-        settings.MEDIA_URL,
-        document_root=settings.MEDIA_ROOT,
-    )
\ No newline at end of file
+if not settings.API_ONLY:
+    from django.contrib import admin
+
+    # Third-party imports
+    from drf_spectacular.views import SpectacularSwaggerView
+
+    from ecommerce.schema import CachedSchemaView
+
+    urlpatterns += [
+        path('admin/', admin.site.urls),
+
+        # API Documentation
+        path('api/schema/', CachedSchemaView.as_view(), name='schema'),
+        path(
+            'api/docs/',
+            SpectacularSwaggerView.as_view(url_name='schema'),
+            name='swagger-ui',
+        ),
+    ]
@@ -7,10 +7,18 @@ For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
 """
 
+import gc
 import os
 
 from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ecommerce.settings')
 
 application = get_wsgi_application()
+
+# Import every view before uWSGI forks its workers so they share the loaded
+# modules, then move them out of the collector's reach: gc passes would
+# otherwise write to those pages and undo the copy-on-write sharing.
+get_resolver().url_patterns
+gc.freeze()
@@ -0,0 +1,67 @@
+"""
+Retention for contact messages.
+
+Old messages are moved from ``coreapp_contact`` to ``coreapp_contactarchive``
+in small batches, each a single ``DELETE ... RETURNING`` feeding an
+``INSERT`` in its own transaction, so no lock is held for long and the hot
+table only keeps recent rows. The same statement appends a ``ChangeLog``
+tombstone per moved message, so change-feed clients see the deletes.
+"""
+from django.db import connection, transaction
+
+from coreapp.models import ChangeLog, Contact, ContactArchive
+from property.changes import TRACKED_MODELS
+
+DEFAULT_BATCH_SIZE = 5000
+
+ARCHIVE_SQL = """
+    WITH moved AS (
+        DELETE FROM {contact}
+        WHERE id IN (
+            SELECT id FROM {contact}
+            WHERE created_at < %s
+            ORDER BY id
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING id, rent_id, message, created_at, idempotency_key
+    ),
+    archived AS (
+        INSERT INTO {archive} (id, rent_id, message, created_at, idempotency_key, archived_at)
+        SELECT id, rent_id, message, created_at, idempotency_key, now() FROM moved
+    )
+    INSERT INTO {changelog} (model, object_id, action, created_at)
+    SELECT %s, id, %s, now() FROM moved ORDER BY id
+"""
+
+PURGE_SQL = """
+    DELETE FROM {archive}
+    WHERE id IN (SELECT id FROM {archive} WHERE created_at < %s ORDER BY id LIMIT %s)
+"""
+
+
+def _run_batches(sql, params, before, batch_size):
+    """Execute a batched statement until it affects no rows; return the total."""
+    sql = sql.format(
+        contact=Contact._meta.db_table,
+        archive=ContactArchive._meta.db_table,
+        changelog=ChangeLog._meta.db_table,
+    )
+    total = 0
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql, [before, batch_size, *params])
+            count = cursor.rowcount
+        if not count:
+            return total
+        total += count
+
+
+def archive_contacts(before, batch_size=DEFAULT_BATCH_SIZE):
+    """Move messages created before ``before`` to the archive table."""
+    return _run_batches(ARCHIVE_SQL, [TRACKED_MODELS[Contact], ChangeLog.DELETE], before, batch_size)
+
+
+def purge_archive(before, batch_size=DEFAULT_BATCH_SIZE):
+    """Delete archived messages created before ``before``."""
+    return _run_batches(PURGE_SQL, [], before, batch_size)
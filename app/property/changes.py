@@ -0,0 +1,61 @@
+"""
+Change feed for incremental catalog sync.
+
+Signals append a ``ChangeLog`` row for every save or delete of a tracked
+model, so consumers can poll ``changes/?since=<cursor>`` for deltas instead
+of re-reading the whole listing.
+"""
+from datetime import timedelta
+
+from django.utils import timezone
+
+from coreapp.models import ChangeLog, Contact, Rent, Wishlist
+from property.documents import get_documents
+
+TRACKED_MODELS = {Rent: 'rent', Wishlist: 'wishlist', Contact: 'contact'}
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 1000
+# Entries younger than this are held back: ids are allocated before commit, so
+# a slow transaction can make a lower id visible after a higher one.
+SETTLE_TIME = timedelta(seconds=2)
+
+
+def record_change(instance, action):
+    """Append a change for a tracked instance."""
+    ChangeLog.objects.create(model=TRACKED_MODELS[type(instance)], object_id=instance.pk, action=action)
+
+
+def get_changes(since=0, limit=DEFAULT_LIMIT, model=None, request=None):
+    """Return the changes after cursor ``since`` and the cursor to resume from.
+
+    Repeated changes of one object within the page collapse to the latest, and
+    listing upserts carry the current listing document.
+    """
+    settled = timezone.now() - SETTLE_TIME
+    changes = ChangeLog.objects.filter(id__gt=since, created_at__lte=settled).order_by('id')
+    if model:
+        changes = changes.filter(model=model)
+    rows = list(changes.values_list('id', 'model', 'object_id', 'action', 'created_at')[:limit])
+
+    latest = {}
+    for change_id, name, object_id, action, created_at in rows:
+        latest.pop((name, object_id), None)
+        latest[(name, object_id)] = {
+            'id': change_id,
+            'model': name,
+            'object_id': object_id,
+            'action': action,
+            'changed_at': created_at,
+        }
+
+    upserted = [key[1] for key, change in latest.items() if key[0] == 'rent' and change['action'] == ChangeLog.UPSERT]
+    documents = {document['id']: document for document in get_documents(Rent.objects.filter(id__in=upserted), request=request)}
+    for (name, object_id), change in latest.items():
+        if name == 'rent' and object_id in documents:
+            change['data'] = documents[object_id]
+
+    return {
+        'results': list(latest.values()),
+        'cursor': rows[-1][0] if rows else since,
+        'has_more': len(rows) == limit,
+    }
@@ -0,0 +1,50 @@
+"""
+Conditional GET support for property resources.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import quote_etag
+
+
+class ConditionalListMixin:
+    """Answer listing requests with 304 when the matching rows are unchanged.
+
+    The ETag comes from ``max(updated_at)`` and the row count of the filtered
+    queryset, so an edit, insert or delete of a matching listing changes it.
+    No ``Last-Modified`` is sent and ``If-Modified-Since`` is ignored: the
+    newest ``updated_at`` of a collection does not move when a row is deleted
+    or leaves the filter, or on a second edit within the same second.
+    """
+    cache_max_age = 30
+
+    def get_etag_parts(self):
+        """Return extra request-specific values that the ETag depends on."""
+        return []
+
+    def conditional_response(self, queryset, build_response):
+        """Return a 304 if the client is current, else the built response."""
+        stats = queryset.order_by().aggregate(last_modified=Max('updated_at'), count=Count('id'))
+        last_modified = stats['last_modified']
+        renderer = getattr(self.request, 'accepted_renderer', None)
+        parts = [
+            self.request.get_full_path(),
+            getattr(renderer, 'format', ''),
+            last_modified.isoformat() if last_modified else '',
+            stats['count'],
+            *self.get_etag_parts(),
+        ]
+        etag = quote_etag(hashlib.md5(repr(parts).encode()).hexdigest())
+
+        response = get_conditional_response(self.request, etag=etag)
+        if response is None:
+            response = build_response()
+
+        response['ETag'] = etag
+        if self.request.user.is_authenticated:
+            patch_cache_control(response, private=True, max_age=self.cache_max_age)
+        else:
+            patch_cache_control(response, public=True, max_age=self.cache_max_age)
+        patch_vary_headers(response, ['Accept', 'Authorization'])
+        return response
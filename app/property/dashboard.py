@@ -0,0 +1,54 @@
+"""
+Per-owner listing dashboard.
+"""
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from coreapp.models import Contact, Rent, Wishlist
+from property.documents import get_documents
+
+
+def _count_per_listing(model, field):
+    """Return a correlated subquery counting ``model`` rows per listing."""
+    counts = (
+        model.objects.filter(**{field: OuterRef('pk')})
+        .order_by()
+        .values(field)
+        .annotate(total=Count('*'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def owner_dashboard(owner, request=None):
+    """Return the owner's listings with wishlist and contact counts, plus totals.
+
+    Counts come from correlated subqueries rather than joins, so they do not
+    multiply each other, and the whole dashboard costs a fixed number of
+    queries however many listings the owner has.
+    """
+    listings = Rent.objects.filter(owner=owner).order_by('-created_at')
+    counts = {
+        row['id']: row
+        for row in listings.annotate(
+            wishlist_count=_count_per_listing(Wishlist, 'property'),
+            contact_count=_count_per_listing(Contact, 'rent'),
+        ).values('id', 'wishlist_count', 'contact_count')
+    }
+    results = [
+        {
+            **document,
+            'wishlist_count': counts[document['id']]['wishlist_count'],
+            'contact_count': counts[document['id']]['contact_count'],
+        }
+        for document in get_documents(listings.filter(id__in=list(counts)), request=request)
+    ]
+    return {
+        'totals': {
+            'listings': len(results),
+            'active_listings': sum(1 for document in results if document['is_active']),
+            'wishlist_count': sum(document['wishlist_count'] for document in results),
+            'contact_count': sum(document['contact_count'] for document in results),
+        },
+        'results': results,
+    }
@@ -0,0 +1,71 @@
+"""
+Precomputed JSON documents for property listings.
+
+Each listing is serialized once per version and stored in the cache under
+a key derived from ``(id, updated_at)``. A save produces a new key, so stale
+documents are never served and simply expire. Documents are built without a
+request, so media fields hold site-relative paths until ``get_documents``
+formats them for one.
+"""
+from django.core.cache import cache
+
+from coreapp.models import Rent
+from property import serializers
+
+DOCUMENT_TIMEOUT = 60 * 60 * 24
+# Bump when the document layout changes so documents cached by older code
+# are never read.
+DOCUMENT_VERSION = 2
+MEDIA_FIELDS = ('image',)
+
+
+def document_key(rent_id, updated_at):
+    """Return the cache key for a version of a listing document."""
+    return f'property_raw_v{DOCUMENT_VERSION}_{rent_id}_{updated_at.timestamp():.6f}'
+
+
+def build_document(rent):
+    """Serialize a listing and store the raw document in the cache."""
+    document = dict(serializers.PropertySerializer().to_raw_representation(rent))
+    cache.set(document_key(rent.id, rent.updated_at), document, DOCUMENT_TIMEOUT)
+    return document
+
+
+def absolute_media_urls(document, request):
+    """Make the document's media paths absolute URLs for ``request``, in place."""
+    for field in MEDIA_FIELDS:
+        if document.get(field):
+            document[field] = request.build_absolute_uri(document[field])
+    return document
+
+
+def get_documents(queryset, fields=None, formats=None, request=None):
+    """Return listing documents for a queryset, preserving its order.
+
+    Only ``id`` and ``updated_at`` are read for the whole page; documents are
+    batch-fetched with ``get_many`` and just the misses are hydrated. When
+    ``fields`` is given the documents are projected to those fields, and misses
+    load only those columns instead of warming the cache. Documents are stored
+    raw and formatted per request with ``formats``; given the ``request``,
+    media paths become absolute URLs as the serializer would return them.
+    """
+    versions = list(queryset.values_list('id', 'updated_at'))
+    keys = {document_key(rent_id, updated_at): rent_id for rent_id, updated_at in versions}
+    documents = {keys[key]: document for key, document in cache.get_many(keys).items()}
+
+    missing = [rent_id for rent_id, _ in versions if rent_id not in documents]
+    if missing and fields is None:
+        for rent in Rent.objects.filter(id__in=missing):
+            documents[rent.id] = build_document(rent)
+    elif missing:
+        serializer = serializers.PropertySerializer(fields=fields)
+        for rent in Rent.objects.filter(id__in=missing).only(*fields):
+            documents[rent.id] = serializer.to_raw_representation(rent)
+
+    ordered = [documents[rent_id] for rent_id, _ in versions if rent_id in documents]
+    if fields is not None:
+        ordered = [{name: value for name, value in document.items() if name in fields} for document in ordered]
+    documents = [serializers.format_property(document, **(formats or {})) for document in ordered]
+    if request is not None:
+        documents = [absolute_media_urls(document, request) for document in documents]
+    return documents
@@ -0,0 +1,53 @@
+"""
+Filters for the property app.
+"""
+import django_filters
+from rest_framework.filters import OrderingFilter
+
+from coreapp.models import Contact, Rent
+
+
+class PropertyFilter(django_filters.FilterSet):
+    """Exact and range filters for property listings."""
+
+    class Meta:
+        model = Rent
+        fields = {
+            'category': ['exact'],
+            'owner': ['exact'],
+            'price': ['exact', 'gte', 'lte'],
+            'bedrooms': ['exact', 'gte', 'lte'],
+            'bathrooms': ['exact', 'gte', 'lte'],
+            'parking_spaces': ['exact'],
+        }
+
+
+class ContactFilter(django_filters.FilterSet):
+    """Date-range and listing filters for contact messages."""
+    created_after = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='gte')
+    created_before = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='lt')
+
+    class Meta:
+        model = Contact
+        fields = ['rent', 'created_after', 'created_before']
+
+
+class StableOrderingFilter(OrderingFilter):
+    """``?ordering=`` with ``-id`` appended, so listings with equal keys keep one order.
+
+    Without a unique last key, listings with the same price or popularity
+    can come back in any order and repeat or go missing across pages.
+    """
+    ordering_description = (
+        'Sort by price, created_at or popularity; prefix a field with "-" to reverse it. '
+        'popularity sorts least popular first, so use -popularity for the most popular. '
+        'Ties are broken by newest listing.'
+    )
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        if any(field.lstrip('-') in ('id', 'pk') for field in ordering):
+            return ordering
+        return [*ordering, '-id']
@@ -0,0 +1,34 @@
+"""
+Move old contact messages to the archive table and purge expired ones.
+
+Messages older than ``--days`` leave ``Contact`` for ``ContactArchive``, each
+batch in one statement that also logs a delete in the change feed. With
+``--purge-days`` archived messages past that age are then deleted for good;
+by default the archive is kept.
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from property.archive import DEFAULT_BATCH_SIZE, archive_contacts, purge_archive
+
+
+class Command(BaseCommand):
+    help = 'Archive contact messages older than --days and purge archived ones older than --purge-days.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=90,
+                            help='Archive messages older than this many days.')
+        parser.add_argument('--purge-days', type=int, default=None,
+                            help='Delete archived messages older than this many days; keep them by default.')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        archived = archive_contacts(now - timedelta(days=options['days']), options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Archived {archived} contact messages.'))
+
+        if options['purge_days'] is not None:
+            purged = purge_archive(now - timedelta(days=options['purge_days']), options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'Purged {purged} archived messages.'))
@@ -0,0 +1,23 @@
+"""
+Precompute similar listings for the ``similar/`` endpoint.
+
+By default only listings that changed, or whose neighbours changed or were
+deactivated, are recomputed; run with ``--full`` (e.g. nightly) so new
+listings also show up among the neighbours of unchanged ones.
+"""
+from django.core.management.base import BaseCommand
+
+from property.neighbors import DEFAULT_BATCH_SIZE, DEFAULT_NEIGHBORS, build_neighbors
+
+
+class Command(BaseCommand):
+    help = 'Compute the most similar listings for each active listing.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Recompute every listing.')
+        parser.add_argument('--k', type=int, default=DEFAULT_NEIGHBORS, help='Neighbours kept per listing.')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        built = build_neighbors(options['full'], options['k'], options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Built neighbours for {built} listings.'))
@@ -0,0 +1,23 @@
+"""
+Deliver listings created or updated since the last run to saved-search inboxes.
+
+Reads listing upserts from the change feed past each search's cursor (skipping
+ones younger than the settle time), runs the matching searches over just
+those listings, adds the matches to the owners' inboxes and advances the
+cursors. A listing already in an inbox is not added again, so repeated or
+overlapping runs deliver nothing twice.
+"""
+from django.core.management.base import BaseCommand
+
+from property.saved_searches import DEFAULT_BATCH_SIZE, match_saved_searches
+
+
+class Command(BaseCommand):
+    help = 'Match recently changed listings against saved searches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        changes, matches = match_saved_searches(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Checked {changes} listing changes, found {matches} matches.'))
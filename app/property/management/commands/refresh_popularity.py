@@ -0,0 +1,25 @@
+"""
+Fold queued wishlist and contact events into listing popularity scores.
+
+Drains ``PopularityEvent`` in batches, adding each event's decayed weight to
+its listing's score and stamping ``popularity_updated_at``, which changes the
+ETag of trending and popularity-ordered lists. Until this runs, new
+engagement does not show in those rankings. ``--max-batches``
+bounds a run; batches are claimed with ``SKIP LOCKED``, so runs may overlap.
+"""
+from django.core.management.base import BaseCommand
+
+from property.popularity import DEFAULT_BATCH_SIZE, refresh_popularity
+
+
+class Command(BaseCommand):
+    help = 'Apply queued engagement events to listing popularity scores.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--max-batches', type=int, default=None,
+                            help='Stop after this many batches; drain the queue by default.')
+
+    def handle(self, *args, **options):
+        processed = refresh_popularity(options['batch_size'], options['max_batches'])
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} popularity events.'))
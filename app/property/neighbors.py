@@ -0,0 +1,132 @@
+"""
+Precomputed nearest neighbours for similar-listing recommendations.
+
+Every active listing becomes a weighted feature vector (category, location
+words, log price, bedrooms, bathrooms, parking). Nearest neighbours by
+Euclidean distance are found in batches with one matrix product per batch
+and stored in ``RentNeighbors``, so the API reads them with a single lookup
+(see ``property.similar``). numpy is only imported here, by the build command.
+"""
+import re
+import zlib
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from coreapp.models import Rent, RentNeighbors
+
+DEFAULT_NEIGHBORS = 10
+DEFAULT_BATCH_SIZE = 256
+LOCATION_BUCKETS = 64
+WEIGHTS = {
+    'category': 2.0,
+    'location': 1.0,
+    'price': 1.5,
+    'bedrooms': 1.0,
+    'bathrooms': 0.5,
+    'parking_spaces': 0.25,
+}
+FEATURE_FIELDS = ['id', 'category', 'location', 'price', 'bedrooms', 'bathrooms', 'parking_spaces', 'updated_at']
+
+_word_re = re.compile(r'\w+')
+
+
+def _standardize(values):
+    """Scale a column to zero mean and unit variance."""
+    spread = values.std()
+    return (values - values.mean()) / spread if spread else np.zeros_like(values)
+
+
+def build_features(rows):
+    """Return the weighted feature matrix for ``FEATURE_FIELDS`` rows."""
+    categories = sorted({row[1] for row in rows})
+    category_index = {category: i for i, category in enumerate(categories)}
+
+    category = np.zeros((len(rows), len(categories)), dtype=np.float32)
+    location = np.zeros((len(rows), LOCATION_BUCKETS), dtype=np.float32)
+    for i, row in enumerate(rows):
+        category[i, category_index[row[1]]] = 1
+        for word in _word_re.findall(row[2].lower()):
+            location[i, zlib.crc32(word.encode()) % LOCATION_BUCKETS] = 1
+    norms = np.linalg.norm(location, axis=1, keepdims=True)
+    location = np.divide(location, norms, out=np.zeros_like(location), where=norms > 0)
+
+    numeric = np.array([row[3:7] for row in rows], dtype=np.float64)
+    columns = [
+        category * WEIGHTS['category'],
+        location * WEIGHTS['location'],
+        (_standardize(np.log1p(numeric[:, 0])) * WEIGHTS['price'])[:, None],
+        (_standardize(numeric[:, 1]) * WEIGHTS['bedrooms'])[:, None],
+        (_standardize(numeric[:, 2]) * WEIGHTS['bathrooms'])[:, None],
+        (numeric[:, 3] * WEIGHTS['parking_spaces'])[:, None],
+    ]
+    return np.hstack(columns).astype(np.float32)
+
+
+def nearest_neighbors(features, positions, k):
+    """Return the ``k`` nearest rows (by position) for each row in ``positions``."""
+    squared = (features ** 2).sum(axis=1)
+    batch = features[positions]
+    distances = squared[positions][:, None] + squared[None, :] - 2 * batch @ features.T
+    distances[np.arange(len(positions)), positions] = np.inf
+    k = min(k, len(features) - 1)
+    if k <= 0:
+        return np.empty((len(positions), 0), dtype=np.int64)
+    nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    order = np.take_along_axis(distances, nearest, axis=1).argsort(axis=1)
+    return np.take_along_axis(nearest, order, axis=1)
+
+
+def stale_listings(rows):
+    """Return ids whose stored neighbours may be out of date.
+
+    A listing is stale when it has no neighbours yet, changed since they were
+    built, or lists a neighbour that changed or is no longer active.
+    """
+    updated = {row[0]: row[-1] for row in rows}
+    stored = list(RentNeighbors.objects.values_list('rent_id', 'neighbor_ids', 'source_updated_at'))
+    changed = {rent_id for rent_id, _, source in stored if updated.get(rent_id) != source}
+    changed |= set(updated) - {rent_id for rent_id, _, _ in stored}
+    gone = {neighbor for _, neighbor_ids, _ in stored for neighbor in neighbor_ids if neighbor not in updated}
+    touched = changed | gone
+    stale = changed | {rent_id for rent_id, neighbor_ids, _ in stored if touched.intersection(neighbor_ids)}
+    return stale & set(updated)
+
+
+def build_neighbors(full=False, k=DEFAULT_NEIGHBORS, batch_size=DEFAULT_BATCH_SIZE):
+    """Compute and store neighbours for all listings, or only the stale ones.
+
+    Returns the number of listings whose neighbours were written.
+    """
+    rows = list(Rent.objects.filter(is_active=True).order_by('id').values_list(*FEATURE_FIELDS))
+    RentNeighbors.objects.exclude(rent__is_active=True).delete()
+    if not rows:
+        return 0
+
+    ids = np.array([row[0] for row in rows])
+    targets = set(ids.tolist()) if full else stale_listings(rows)
+    positions = np.array([i for i, rent_id in enumerate(ids.tolist()) if rent_id in targets], dtype=np.int64)
+    features = build_features(rows)
+    now = timezone.now()
+
+    for start in range(0, len(positions), batch_size):
+        batch = positions[start:start + batch_size]
+        nearest = nearest_neighbors(features, batch, k)
+        neighbors = [
+            RentNeighbors(
+                rent_id=int(ids[position]),
+                neighbor_ids=ids[nearest_row].tolist(),
+                source_updated_at=rows[position][-1],
+                built_at=now,
+            )
+            for position, nearest_row in zip(batch, nearest)
+        ]
+        with transaction.atomic():
+            RentNeighbors.objects.bulk_create(
+                neighbors,
+                update_conflicts=True,
+                unique_fields=['rent'],
+                update_fields=['neighbor_ids', 'source_updated_at', 'built_at'],
+            )
+    return len(positions)
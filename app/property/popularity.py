@@ -0,0 +1,112 @@
+"""
+Decayed popularity scores for property listings.
+
+Scores are kept in log space relative to a fixed epoch: an event of weight
+``w`` at time ``t`` contributes ``log(w) + DECAY_RATE * (t - EPOCH)``, and
+contributions are combined with log-sum-exp. Ordering by the stored value is
+then the same as ordering by the decayed score at any moment, so listings
+without new engagement never need rewriting. A score of 0 means no activity.
+Listings are ranked most popular first with ``?ordering=-popularity``; plain
+``popularity`` is ascending.
+"""
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from coreapp.models import PopularityEvent, Rent
+
+WISHLIST_WEIGHT = 3.0
+CONTACT_WEIGHT = 5.0
+HALF_LIFE = timedelta(days=3)
+DECAY_RATE = math.log(2) / HALF_LIFE.total_seconds()
+EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+
+DEFAULT_BATCH_SIZE = 1000
+TRENDING_WINDOW = timedelta(days=7)
+TRENDING_LIMIT = 20
+
+
+def record_event(rent_id, weight):
+    """Queue engagement with a listing for the next popularity refresh."""
+    PopularityEvent.objects.create(rent_id=rent_id, weight=weight)
+
+
+def event_score(weight, created_at):
+    """Return the log-space contribution of a single event."""
+    return math.log(weight) + DECAY_RATE * (created_at - EPOCH).total_seconds()
+
+
+def combine_scores(current, score):
+    """Add a log-space contribution to a stored score."""
+    if not current:
+        return score
+    high, low = max(current, score), min(current, score)
+    return high + math.log1p(math.exp(low - high))
+
+
+def popularity_version():
+    """Return a token that changes whenever popularity scores are refreshed.
+
+    It is read from the database, so a refresh run by any process (usually
+    the cron command) is seen by every web worker.
+    """
+    latest = Rent.objects.aggregate(latest=Max('popularity_updated_at'))['latest']
+    return latest.isoformat() if latest else ''
+
+
+def refresh_popularity(batch_size=DEFAULT_BATCH_SIZE, max_batches=None):
+    """Fold queued events into listing scores, one batch per transaction.
+
+    Events are claimed with ``SKIP LOCKED`` so several workers can drain the
+    queue at once. Returns the number of events processed.
+    """
+    processed = batches = 0
+    while max_batches is None or batches < max_batches:
+        with transaction.atomic():
+            events = list(
+                PopularityEvent.objects.select_for_update(skip_locked=True)
+                .order_by('id')
+                .values_list('id', 'rent_id', 'weight', 'created_at')[:batch_size]
+            )
+            if not events:
+                break
+
+            scores = defaultdict(float)
+            engaged = {}
+            for _, rent_id, weight, created_at in events:
+                scores[rent_id] = combine_scores(scores[rent_id], event_score(weight, created_at))
+                engaged[rent_id] = max(engaged.get(rent_id, created_at), created_at)
+
+            rents = list(
+                Rent.objects.select_for_update()
+                .filter(id__in=scores)
+                .order_by('id')
+                .only('id', 'popularity', 'last_engaged_at')
+            )
+            now = timezone.now()
+            for rent in rents:
+                rent.popularity = combine_scores(rent.popularity, scores[rent.id])
+                rent.popularity_updated_at = now
+                if rent.last_engaged_at is None or rent.last_engaged_at < engaged[rent.id]:
+                    rent.last_engaged_at = engaged[rent.id]
+            Rent.objects.bulk_update(rents, ['popularity', 'last_engaged_at', 'popularity_updated_at'])
+            PopularityEvent.objects.filter(id__in=[event[0] for event in events]).delete()
+
+        processed += len(events)
+        batches += 1
+    return processed
+
+
+def trending_queryset(limit=TRENDING_LIMIT):
+    """Return the most popular active listings engaged with recently."""
+    since = timezone.now() - TRENDING_WINDOW
+    ids = list(
+        Rent.objects.filter(is_active=True, last_engaged_at__gte=since)
+        .order_by('-popularity', '-id')
+        .values_list('id', flat=True)[:limit]
+    )
+    return Rent.objects.filter(id__in=ids).order_by('-popularity', '-id')
@@ -0,0 +1,127 @@
+"""
+Saved searches matched incrementally against the change feed.
+
+``match_saved_searches`` (run by ``manage.py match_saved_searches``) reads the
+listing upserts recorded in ``ChangeLog`` after each search's cursor and runs
+the search only over those listings, so the cost follows the number of changed
+listings rather than the size of the catalog. Searches with the same query and
+filters are evaluated once per batch. Matches land in the user's inbox.
+"""
+import json
+import logging
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from coreapp.models import ChangeLog, Rent, SavedSearch, SavedSearchMatch
+from property.changes import SETTLE_TIME
+from property.documents import get_documents
+from property.filters import PropertyFilter
+from property.search import search_queryset
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+MAX_SAVED_SEARCHES = 20
+INBOX_LIMIT = 100
+
+
+def current_cursor():
+    """Return the latest change id, so new searches only see later listings."""
+    return ChangeLog.objects.aggregate(cursor=Max('id'))['cursor'] or 0
+
+
+def search_results(query, filters, queryset):
+    """Apply a saved search's text query and filters to ``queryset``."""
+    if query:
+        queryset = search_queryset(query).filter(id__in=queryset.values('id'))
+    return PropertyFilter(filters, queryset=queryset).qs
+
+
+def _match_batch(changes, searches):
+    """Return the matches for one batch of ``(change_id, rent_id)`` changes."""
+    groups = defaultdict(list)
+    for search in searches:
+        groups[(search.query, json.dumps(search.filters, sort_keys=True))].append(search)
+
+    matches = []
+    for (query, _), group in groups.items():
+        filterset = PropertyFilter(group[0].filters)
+        if not filterset.is_valid():
+            logger.warning("Skipping saved searches %s with invalid filters: %s",
+                           [search.id for search in group], filterset.errors.as_json())
+            continue
+        since = min(search.last_change_id for search in group)
+        candidates = {rent_id for change_id, rent_id in changes if change_id > since}
+        active = Rent.objects.filter(id__in=candidates, is_active=True)
+        matched = set(search_results(query, group[0].filters, active).values_list('id', flat=True))
+        for search in group:
+            changed = {rent_id for change_id, rent_id in changes if change_id > search.last_change_id}
+            matches += [SavedSearchMatch(search=search, rent_id=rent_id) for rent_id in matched & changed]
+    return matches
+
+
+def match_saved_searches(batch_size=DEFAULT_BATCH_SIZE):
+    """Match listings changed since each search's cursor and advance the cursors.
+
+    Returns ``(changes, matches)``: listing changes read and matches found
+    (a listing already in a search's inbox is not added twice).
+    """
+    settled = timezone.now() - SETTLE_TIME
+    total_changes = total_matches = 0
+    while True:
+        start = SavedSearch.objects.aggregate(start=Min('last_change_id'))['start']
+        if start is None:
+            break
+        changes = list(
+            ChangeLog.objects.filter(model='rent', action=ChangeLog.UPSERT, id__gt=start, created_at__lte=settled)
+            .order_by('id')
+            .values_list('id', 'object_id')[:batch_size]
+        )
+        if not changes:
+            break
+        end = changes[-1][0]
+        with transaction.atomic():
+            searches = list(SavedSearch.objects.filter(last_change_id__lt=end).select_for_update())
+            matches = _match_batch(changes, searches)
+            SavedSearchMatch.objects.bulk_create(matches, ignore_conflicts=True)
+            SavedSearch.objects.filter(id__in=[search.id for search in searches]).update(last_change_id=end)
+        total_changes += len(changes)
+        total_matches += len(matches)
+        if len(changes) < batch_size:
+            break
+    return total_changes, total_matches
+
+
+def inbox(user, unread_only=False, limit=INBOX_LIMIT, request=None):
+    """Return the user's newest matches with the matching listing documents."""
+    matches = SavedSearchMatch.objects.filter(search__user=user, rent__is_active=True)
+    if unread_only:
+        matches = matches.filter(read_at__isnull=True)
+    rows = list(
+        matches.order_by('-created_at', '-id')
+        .values('id', 'search_id', 'search__name', 'rent_id', 'created_at', 'read_at')[:limit]
+    )
+    documents = {document['id']: document for document in get_documents(
+        Rent.objects.filter(id__in=[row['rent_id'] for row in rows]), request=request)}
+    return [
+        {
+            'id': row['id'],
+            'search': row['search_id'],
+            'search_name': row['search__name'],
+            'created_at': row['created_at'],
+            'read_at': row['read_at'],
+            'property': documents.get(row['rent_id']),
+        }
+        for row in rows
+    ]
+
+
+def mark_read(user, ids=None):
+    """Mark the user's matches (all, or just ``ids``) as read; return how many."""
+    matches = SavedSearchMatch.objects.filter(search__user=user, read_at__isnull=True)
+    if ids is not None:
+        matches = matches.filter(id__in=ids)
+    return matches.update(read_at=timezone.now())
@@ -0,0 +1,71 @@
+"""
+Trigram-backed search helpers for the property app.
+"""
+import hashlib
+import logging
+
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.core.cache import cache
+from django.db import DatabaseError, connections, router, transaction
+
+from coreapp.models import Rent
+
+logger = logging.getLogger(__name__)
+
+TRIGRAM_MIN_LENGTH = 3
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_CACHE_TIMEOUT = 60
+AUTOCOMPLETE_STATEMENT_TIMEOUT_MS = 150
+
+
+def search_queryset(query):
+    """Return listings whose name matches the query, tolerating typos."""
+    if len(query) < TRIGRAM_MIN_LENGTH:
+        return Rent.objects.filter(name__icontains=query)
+    return (
+        Rent.objects.filter(name__trigram_word_similar=query)
+        .annotate(similarity=TrigramWordSimilarity(query, 'name'))
+        .order_by('-similarity', '-created_at')
+    )
+
+
+def autocomplete(query, limit=AUTOCOMPLETE_LIMIT):
+    """Return cached name and location suggestions for a query prefix."""
+    query = query.strip().lower()
+    if len(query) < TRIGRAM_MIN_LENGTH:
+        return {'names': [], 'locations': []}
+
+    key = 'property_autocomplete_' + hashlib.md5(f'{limit}:{query}'.encode()).hexdigest()
+    suggestions = cache.get(key)
+    if suggestions is None:
+        suggestions = _suggest(query, limit)
+        if suggestions is not None:
+            cache.set(key, suggestions, AUTOCOMPLETE_CACHE_TIMEOUT)
+    return suggestions or {'names': [], 'locations': []}
+
+
+def _suggest(query, limit):
+    """Query the trigram indexes, giving up once the latency budget is spent."""
+    alias = router.db_for_read(Rent)
+    active = Rent.objects.using(alias).filter(is_active=True)
+    try:
+        with transaction.atomic(using=alias):
+            with connections[alias].cursor() as cursor:
+                cursor.execute(f'SET LOCAL statement_timeout = {int(AUTOCOMPLETE_STATEMENT_TIMEOUT_MS)}')
+            names = list(
+                active.filter(name__trigram_word_similar=query)
+                .annotate(similarity=TrigramWordSimilarity(query, 'name'))
+                .order_by('-similarity')
+                .values('id', 'name')[:limit]
+            )
+            locations = list(
+                active.filter(location__trigram_word_similar=query)
+                .annotate(similarity=TrigramWordSimilarity(query, 'location'))
+                .order_by('-similarity')
+                .values_list('location', flat=True)
+                .distinct()[:limit]
+            )
+    except DatabaseError as e:
+        logger.warning("Autocomplete for %r exceeded its budget: %s", query, e)
+        return None
+    return {'names': names, 'locations': locations}
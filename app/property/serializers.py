@@ -1,21 +1,55 @@
 """"
 Serializers for the property app.
 """
-from drf_spectacular.utils import extend_schema_field
+from datetime import datetime
+
 from rest_framework import serializers
-from coreapp.models import Rent, Wishlist, Contact
+from coreapp.models import Rent, Wishlist, Contact, SavedSearch
+from ecommerce.openapi import extend_schema_field
+from property.filters import PropertyFilter
+
+PRICE_FORMATS = ('display', 'numeric')
+TIMESTAMP_FORMATS = ('display', 'epoch')
+
+
+def format_property(representation, price_format='display', timestamp_format='display'):
+    """Apply the client's price and timestamp formats to a raw property representation.
+
+    ``display`` keeps the historical ``"$1234.00"`` price and
+    ``"YYYY-MM-DD HH:MM:SS"`` timestamps; ``numeric`` and ``epoch`` return
+    numbers that are smaller and cheaper to decode.
+    """
+    formatted = dict(representation)
+    if formatted.get('price') is not None:
+        price = float(formatted['price'])
+        formatted['price'] = price if price_format == 'numeric' else f"${price:.2f}"
+    for field in ('created_at', 'updated_at'):
+        if formatted.get(field):
+            value = datetime.fromisoformat(formatted[field])
+            if timestamp_format == 'epoch':
+                formatted[field] = int(value.timestamp())
+            else:
+                formatted[field] = value.strftime('%Y-%m-%d %H:%M:%S')
+    return formatted
+
 
 class PropertySerializer(serializers.ModelSerializer):
     """Serializer for the property object."""
+    def __init__(self, *args, fields=None, **kwargs):
+        """Optionally restrict the serializer to a subset of fields."""
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
     class Meta:
         model = Rent
-        fields = '__all__'
-        read_only_fields = ('id','created_at', 'updated_at')
+        exclude = ('popularity', 'last_engaged_at')
+        read_only_fields = ('id', 'owner', 'created_at', 'updated_at')
         extra_kwargs = {
             'name': {'required': True},
             'description': {'required': True},
             'price': {'required': True},
-            'owner': {'required': True},
             'features': {'required': True},
             'type': {'required': True},
             'contact_number': {'required': True},
@@ -34,21 +68,22 @@ class PropertySerializer(serializers.ModelSerializer):
         """Update a property"""
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save(update_fields=validated_data.keys())
+        # auto_now fields are only written when listed in update_fields
+        instance.save(update_fields=[*validated_data.keys(), 'updated_at'])
         return instance
     
+    def to_raw_representation(self, instance):
+        """Convert the property object to a dictionary without display formatting."""
+        return super().to_representation(instance)
+
     def to_representation(self, instance):
         """Convert the property object to a dictionary."""
-        representation = super().to_representation(instance)
-        representation['price'] = f"${float(representation['price']):.2f}"
-        representation['created_at'] = instance.created_at.strftime('%Y-%m-%d %H:%M:%S')
-        representation['updated_at'] = instance.updated_at.strftime('%Y-%m-%d %H:%M:%S')
-        return representation
+        return format_property(self.to_raw_representation(instance), **self.context.get('formats', {}))
     
 class PropertyDetailSerializer(serializers.ModelSerializer):
     """Serializer for the property detail view."""
     class Meta(PropertySerializer.Meta):
-        fields = PropertySerializer.Meta.fields 
+        exclude = PropertySerializer.Meta.exclude
 
 
 class WishListSerializer(serializers.ModelSerializer):
@@ -126,4 +161,25 @@ class  RecipeImageSerializer(serializers.ModelSerializer):
         }
     
 
-    
\ No newline at end of file
+    
+
+
+class SavedSearchSerializer(serializers.ModelSerializer):
+    """Serializer for a saved search: a text query plus listing filters."""
+
+    class Meta:
+        model = SavedSearch
+        fields = ['id', 'name', 'query', 'filters', 'created_at']
+        read_only_fields = ['id', 'created_at']
+
+    def validate_filters(self, value):
+        """Accept only filters the listing endpoints understand, with valid values."""
+        if not isinstance(value, dict):
+            raise serializers.ValidationError('Must be an object of listing filters.')
+        unknown = sorted(set(value) - set(PropertyFilter.base_filters))
+        if unknown:
+            raise serializers.ValidationError(f"Unknown filters: {', '.join(unknown)}")
+        filterset = PropertyFilter(value)
+        if not filterset.is_valid():
+            raise serializers.ValidationError(filterset.errors)
+        return value
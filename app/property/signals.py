@@ -0,0 +1,62 @@
+"""
+Signal handlers for the property app.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from coreapp.models import ChangeLog, Contact, Rent, Wishlist
+from property.changes import record_change
+from property.documents import build_document
+from property.popularity import CONTACT_WEIGHT, WISHLIST_WEIGHT, record_event
+from property.stats import bump_stats_version
+from property.wishlist import invalidate_saved_property_ids
+
+
+@receiver(post_save, sender=Rent)
+def rebuild_property_document(sender, instance, **kwargs):
+    """Rebuild the cached document whenever a listing is saved."""
+    build_document(instance)
+
+
+@receiver(post_save, sender=Rent)
+@receiver(post_delete, sender=Rent)
+def invalidate_property_stats(sender, **kwargs):
+    """Drop cached price statistics whenever listings change."""
+    bump_stats_version()
+
+
+@receiver(post_save, sender=Wishlist)
+@receiver(post_delete, sender=Wishlist)
+def invalidate_saved_ids(sender, instance, **kwargs):
+    """Drop the owner's cached saved ids when a wishlist item is added or removed."""
+    invalidate_saved_property_ids(instance.user_id)
+
+
+@receiver(post_save, sender=Wishlist)
+def record_wishlist_engagement(sender, instance, created, **kwargs):
+    """Count a new wishlist save towards the listing's popularity."""
+    if created:
+        record_event(instance.property_id, WISHLIST_WEIGHT)
+
+
+@receiver(post_save, sender=Contact)
+def record_contact_engagement(sender, instance, created, **kwargs):
+    """Count a new contact message towards the listing's popularity."""
+    if created and instance.rent_id:
+        record_event(instance.rent_id, CONTACT_WEIGHT)
+
+
+@receiver(post_save, sender=Rent)
+@receiver(post_save, sender=Wishlist)
+@receiver(post_save, sender=Contact)
+def record_upsert(sender, instance, **kwargs):
+    """Append a change feed entry for a created or updated object."""
+    record_change(instance, ChangeLog.UPSERT)
+
+
+@receiver(post_delete, sender=Rent)
+@receiver(post_delete, sender=Wishlist)
+@receiver(post_delete, sender=Contact)
+def record_tombstone(sender, instance, **kwargs):
+    """Append a tombstone so consumers drop a deleted object."""
+    record_change(instance, ChangeLog.DELETE)
@@ -0,0 +1,21 @@
+"""
+Similar listings read from the neighbours built by ``manage.py build_neighbors``.
+"""
+from django.db.models import Case, IntegerField, When
+
+from coreapp.models import Rent, RentNeighbors
+
+
+def similar_listings(rent_id):
+    """Return ``(queryset, built_at)`` for a listing's active neighbours, closest first.
+
+    Listings without precomputed neighbours get an empty queryset and None.
+    """
+    stored = RentNeighbors.objects.filter(rent_id=rent_id).values_list('neighbor_ids', 'built_at').first()
+    if not stored or not stored[0]:
+        return Rent.objects.none(), None
+    neighbor_ids, built_at = stored
+    position = Case(*[When(id=pk, then=index) for index, pk in enumerate(neighbor_ids)],
+                    output_field=IntegerField())
+    queryset = Rent.objects.filter(id__in=neighbor_ids, is_active=True).order_by(position)
+    return queryset, built_at
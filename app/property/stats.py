@@ -0,0 +1,91 @@
+"""
+Price statistics for property listings.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db import connections
+
+STATS_VERSION_KEY = 'property_stats_version'
+STATS_TIMEOUT = 60 * 10
+DEFAULT_BUCKETS = 10
+MAX_BUCKETS = 50
+
+PRICE_STATS_SQL = """
+    WITH listing AS ({listing_sql}),
+    bounds AS (
+        SELECT category,
+               count(*) AS total,
+               min(price) AS min_price,
+               max(price) AS max_price,
+               avg(price) AS avg_price,
+               percentile_cont(ARRAY[0.25, 0.5, 0.75, 0.9]) WITHIN GROUP (ORDER BY price) AS percentiles
+        FROM listing
+        GROUP BY category
+    ),
+    histogram AS (
+        SELECT l.category,
+               CASE WHEN b.max_price = b.min_price THEN 1
+                    ELSE least(width_bucket(l.price, b.min_price, b.max_price, %s), %s)
+               END AS bucket,
+               count(*) AS listings
+        FROM listing l
+        JOIN bounds b USING (category)
+        GROUP BY 1, 2
+    )
+    SELECT b.category, b.total, b.min_price, b.max_price, b.avg_price, b.percentiles,
+           json_agg(json_build_array(h.bucket, h.listings) ORDER BY h.bucket)
+    FROM bounds b
+    JOIN histogram h USING (category)
+    GROUP BY b.category, b.total, b.min_price, b.max_price, b.avg_price, b.percentiles
+    ORDER BY b.category
+"""
+
+
+def bump_stats_version():
+    """Invalidate every cached statistics result."""
+    cache.set(STATS_VERSION_KEY, time.time_ns(), None)
+
+
+def get_price_stats(queryset, query_string, buckets=DEFAULT_BUCKETS):
+    """Return cached per-category price statistics for a filtered queryset."""
+    version = cache.get_or_set(STATS_VERSION_KEY, time.time_ns, None)
+    digest = hashlib.md5(f'{buckets}:{query_string}'.encode()).hexdigest()
+    key = f'property_price_stats_{version}_{digest}'
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_price_stats(queryset, buckets)
+        cache.set(key, stats, STATS_TIMEOUT)
+    return stats
+
+
+def compute_price_stats(queryset, buckets=DEFAULT_BUCKETS):
+    """Compute min/max/percentiles and a price histogram per category in one query."""
+    listing_sql, params = queryset.order_by().values('category', 'price').query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(PRICE_STATS_SQL.format(listing_sql=listing_sql), [*params, buckets, buckets])
+        rows = cursor.fetchall()
+
+    stats = []
+    for category, total, min_price, max_price, avg_price, percentiles, histogram in rows:
+        low, high = float(min_price), float(max_price)
+        width = (high - low) / buckets if high > low else 0
+        counts = dict(histogram)
+        stats.append({
+            'category': category,
+            'count': total,
+            'min': low,
+            'max': high,
+            'avg': round(float(avg_price), 2),
+            'percentiles': dict(zip(['p25', 'p50', 'p75', 'p90'], percentiles)),
+            'histogram': [
+                {
+                    'from': round(low + index * width, 2),
+                    'to': round(low + (index + 1) * width, 2) if width else high,
+                    'count': counts.get(index + 1, 0),
+                }
+                for index in range(buckets if width else 1)
+            ],
+        })
+    return stats
@@ -0,0 +1,44 @@
+"""
+Tests for conditional GETs on the listing endpoints.
+"""
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils.http import http_date
+
+from coreapp.models import Rent, User
+
+LIST_URL = '/api/property/list/'
+
+
+class ConditionalListTests(TestCase):
+    """Listing responses revalidate on their ETag only."""
+
+    def setUp(self):
+        cache.clear()
+        owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.rents = [
+            Rent.objects.create(
+                owner=owner, name=f'Flat {number}', description='Flat', location='Lagos', price=100,
+                category='flat', bedrooms=1, bathrooms=1, is_active=True,
+            )
+            for number in range(2)
+        ]
+
+    def test_matching_etag_is_not_modified(self):
+        etag = self.client.get(LIST_URL)['ETag']
+        self.assertEqual(self.client.get(LIST_URL, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_delete_changes_etag(self):
+        etag = self.client.get(LIST_URL)['ETag']
+        self.rents[0].delete()
+        response = self.client.get(LIST_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 1)
+
+    def test_if_modified_since_is_ignored_after_delete(self):
+        response = self.client.get(LIST_URL)
+        self.assertNotIn('Last-Modified', response)
+        self.rents[0].delete()
+        response = self.client.get(LIST_URL, HTTP_IF_MODIFIED_SINCE=http_date())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 1)
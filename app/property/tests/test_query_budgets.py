@@ -0,0 +1,110 @@
+"""
+Tests that every view with a query budget stays within it.
+
+``QUERY_BUDGET_MODE = 'raise'`` turns a violation into an exception, so each
+test fails with the offending SQL listed.
+"""
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from coreapp.models import Contact, Rent, SavedSearch, SavedSearchMatch, User, Wishlist
+from ecommerce.querybudget import counts_toward_budget
+from property.saved_searches import current_cursor
+
+
+@override_settings(QUERY_BUDGET_MODE='raise')
+class QueryBudgetTests(TestCase):
+    """Budgeted views run within their budget, on a cold and a warm cache."""
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='user', email='user@example.com', password='pw')
+        self.rents = [
+            Rent.objects.create(
+                owner=self.user, name=f'Flat {number}', description='Flat', location='Lagos',
+                price=100 + number, category='flat', bedrooms=1, bathrooms=1, is_active=True,
+            )
+            for number in range(3)
+        ]
+        # Engaged listings, so trending and popularity ordering have rows.
+        Rent.objects.filter(id__in=[rent.id for rent in self.rents[:2]]).update(
+            popularity=1.0, last_engaged_at=timezone.now(), popularity_updated_at=timezone.now())
+        self.saved = Wishlist.objects.create(user=self.user, property=self.rents[0])
+        Contact.objects.create(rent=self.rents[0], message='Hi')
+        self.search = SavedSearch.objects.create(user=self.user, name='Flats', last_change_id=current_cursor())
+        SavedSearchMatch.objects.create(search=self.search, rent=self.rents[1])
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(self.user)}'}
+
+    def request(self, method, path, data=None, expected=200, **extra):
+        """Send the request on a cold, then a warm cache (once if it changes state)."""
+        send = getattr(self.client, method)
+        runs = 2 if method == 'get' else 1
+        cache.clear()
+        for _ in range(runs):
+            response = send(path, data, content_type='application/json', **self.auth, **extra)
+            self.assertEqual(response.status_code, expected, response.content)
+        return response
+
+    def test_property_list(self):
+        for path in ('/api/property/list/', f'/api/property/list/?id={self.rents[0].id}',
+                     '/api/property/list/?ordering=-popularity', '/api/property/search/?query=flat',
+                     '/api/property/trending/'):
+            with self.subTest(path=path):
+                self.assertTrue(self.request('get', path).json())
+        for path in (f'/api/property/{self.rents[0].id}/similar/', '/api/property/price-stats/',
+                     '/api/property/autocomplete/?query=flat'):
+            with self.subTest(path=path):
+                self.request('get', path)
+
+    def test_owner_dashboard(self):
+        self.request('get', '/api/property/dashboard/')
+
+    def test_wishlist(self):
+        self.request('get', '/api/property/saved/')
+        self.request('get', f'/api/property/wishlist/{self.saved.id}/detail/')
+        self.request('post', '/api/property/saved/', {'property_id': self.rents[1].id}, expected=201)
+        self.request('post', '/api/property/saved/', {'property_id': self.rents[2].id}, expected=201,
+                     HTTP_IDEMPOTENCY_KEY='save-1')
+        self.request('post', '/api/property/saved/', {'property_id': self.rents[2].id}, expected=201,
+                     HTTP_IDEMPOTENCY_KEY='save-1')
+        self.request('post', '/api/property/saved/', {'property_id': 0}, expected=404)
+        self.request('delete', f'/api/property/wishlist/{self.saved.id}/', expected=204)
+
+    def test_contact_detail(self):
+        self.request('get', '/api/property/contact/')
+
+    @override_settings(REPLICA_DATABASE='replica')
+    def test_replica_lag_probe_is_not_counted(self):
+        # Anonymous, since the mirror does not see this test's uncommitted user.
+        cache.delete('replica_lag')
+        response = self.client.get('/api/property/contact/')
+        self.assertEqual(response.status_code, 200, response.content)
+        # Only the contact list itself; the probe ran but is not counted.
+        self.assertEqual(response['X-Query-Count'], '1')
+
+    def test_saved_searches(self):
+        self.request('get', '/api/property/searches/')
+        self.request('get', f'/api/property/searches/{self.search.id}/')
+        response = self.request('post', '/api/property/searches/', {'name': 'Cheap', 'filters': {'price__lte': 150}},
+                                expected=201)
+        self.request('put', f'/api/property/searches/{response.json()["id"]}/', {'name': 'Cheaper'})
+        self.request('delete', f'/api/property/searches/{self.search.id}/', expected=204)
+
+    def test_saved_search_inbox(self):
+        self.request('get', '/api/property/inbox/')
+        self.request('get', '/api/property/inbox/?unread=true')
+        self.request('post', '/api/property/inbox/read/', {'ids': [1]})
+        self.request('post', '/api/property/inbox/read/', {})
+
+
+class CountsTowardBudgetTests(SimpleTestCase):
+    """Savepoints are not charged, so tests and production count alike."""
+
+    def test_savepoints_are_not_counted(self):
+        for sql in ('SAVEPOINT "s1"', 'RELEASE SAVEPOINT "s1"', 'ROLLBACK TO SAVEPOINT "s1"'):
+            with self.subTest(sql=sql):
+                self.assertFalse(counts_toward_budget(sql))
+        self.assertTrue(counts_toward_budget('SELECT 1'))
@@ -0,0 +1,80 @@
+"""
+Tests for the property write endpoints.
+"""
+from django.test import TestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from coreapp.models import Rent, User
+
+
+class PropertyUpdateTests(TestCase):
+    """Admins edit listings without taking them over."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='pw')
+        self.rent = Rent.objects.create(
+            owner=self.owner, name='Flat', description='Flat', location='Lagos', price=100,
+            category='flat', bedrooms=1, bathrooms=1, is_active=True,
+        )
+
+    def test_admin_update_keeps_owner(self):
+        data = {'name': 'Renamed flat', 'description': 'Flat', 'location': 'Lagos', 'price': 100,
+                'category': 'flat', 'bedrooms': 1, 'bathrooms': 1, 'property_type': 'flat',
+                'contact_number': '0800000000', 'contact_email': 'owner@example.com'}
+        response = self.client.put(
+            f'/api/property/update/{self.rent.id}/', data, content_type='application/json',
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.admin)}',
+        )
+        self.rent.refresh_from_db()
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.rent.name, 'Renamed flat')
+        self.assertEqual(self.rent.owner, self.owner)
+
+
+class PropertyDocumentTests(TestCase):
+    """Cached listing documents keep the serializer's absolute media URLs."""
+
+    def setUp(self):
+        owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.rent = Rent.objects.create(
+            owner=owner, name='Flat', description='Flat', location='Lagos', price=100,
+            category='flat', bedrooms=1, bathrooms=1, is_active=True, image='uploads/property/flat.jpg',
+        )
+
+    def test_image_is_absolute_url(self):
+        for path in ('/api/property/list/', '/api/property/list/?fields=id,image'):
+            with self.subTest(path=path):
+                # The second request reads the document back from the cache.
+                for _ in range(2):
+                    document = self.client.get(path).json()[0]
+                    self.assertEqual(document['image'], 'http://testserver/media/uploads/property/flat.jpg')
+
+
+class PropertyOrderingTests(TestCase):
+    """Orderings end with a unique key, so ties come back in one order."""
+
+    def setUp(self):
+        owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.rents = [
+            Rent.objects.create(
+                owner=owner, name=f'Flat {number}', description='Flat', location='Lagos', price=100,
+                category='flat', bedrooms=1, bathrooms=1, is_active=True,
+            )
+            for number in range(3)
+        ]
+        Rent.objects.filter(id=self.rents[0].id).update(popularity=2.0)
+
+    def ids(self, ordering):
+        return [document['id'] for document in self.client.get(f'/api/property/list/?ordering={ordering}').json()]
+
+    def test_most_popular_first_with_ties_by_newest(self):
+        first, second, third = self.rents
+        self.assertEqual(self.ids('-popularity'), [first.id, third.id, second.id])
+
+    def test_ascending_popularity_is_least_popular_first(self):
+        first, second, third = self.rents
+        self.assertEqual(self.ids('popularity'), [third.id, second.id, first.id])
+
+    def test_equal_prices_keep_one_order(self):
+        self.assertEqual(self.ids('price'), sorted((rent.id for rent in self.rents), reverse=True))
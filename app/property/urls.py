@@ -18,6 +18,11 @@ urlpatterns: List[URLPattern] = [
     path('delete/<int:pk>/', views.PropertyViewSet.as_view({'delete': 'destroy'}), name='property_delete'),
     path('list/', views.PropertyListViewSet.as_view({'get': 'list'}), name='property_list'),
     path('search/', views.PropertyListViewSet.as_view({'get': 'search'}), name='property_search'),
+    path('autocomplete/', views.PropertyListViewSet.as_view({'get': 'autocomplete'}), name='property_autocomplete'),
+    path('price-stats/', views.PropertyListViewSet.as_view({'get': 'price_stats'}), name='property_price_stats'),
+    path('<int:pk>/similar/', views.PropertyListViewSet.as_view({'get': 'similar'}), name='property_similar'),
+    path('trending/', views.PropertyListViewSet.as_view({'get': 'trending'}), name='property_trending'),
+    path('dashboard/', views.OwnerDashboardViewSet.as_view({'get': 'list'}), name='owner_dashboard'),
 
     # Wishlist URLs
     path('saved/', views.WishlistViewSet.as_view({'get': 'list', 'post': 'create'}), name='wishlist'),
@@ -29,5 +34,15 @@ urlpatterns: List[URLPattern] = [
     path('message/', views.ContactViewSet.as_view({'post': 'create'}), name='message_create' ),
     path('contact/', views.ContactDetailViewSet.as_view({'get': 'list'}), name='contact_detail'),
 
+    # Saved search URLs
+    path('searches/', views.SavedSearchViewSet.as_view({'get': 'list', 'post': 'create'}), name='saved_searches'),
+    path('searches/<int:pk>/', views.SavedSearchViewSet.as_view(
+        {'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}), name='saved_search_detail'),
+    path('inbox/', views.SavedSearchInboxViewSet.as_view({'get': 'list'}), name='saved_search_inbox'),
+    path('inbox/read/', views.SavedSearchInboxViewSet.as_view({'post': 'read'}), name='saved_search_inbox_read'),
+
+    # Change feed
+    path('changes/', views.ChangeFeedViewSet.as_view({'get': 'list'}), name='change_feed'),
+
 
 ]
\ No newline at end of file
@@ -5,15 +5,30 @@ from rest_framework import viewsets, mixins, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework_simplejwt.authentication import JWTAuthentication
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from ecommerce.openapi import OpenApiTypes, extend_schema
+from rest_framework.filters import SearchFilter
 import logging
 from rest_framework.exceptions import ValidationError
+from django.shortcuts import get_object_or_404
 
 
-from coreapp.models import Rent, Wishlist, Contact
+from coreapp.models import Rent, SavedSearch, Wishlist, Contact
+from ecommerce.idempotency import create_once, idempotent
+from ecommerce.querybudget import query_budget
 from property import  serializers
+from property.changes import DEFAULT_LIMIT, MAX_LIMIT, TRACKED_MODELS, get_changes
+from property.conditional import ConditionalListMixin
+from property.dashboard import owner_dashboard
+from property.documents import get_documents
+from property.filters import ContactFilter, PropertyFilter, StableOrderingFilter
+from property.popularity import TRENDING_LIMIT, popularity_version, trending_queryset
+from property.saved_searches import INBOX_LIMIT, MAX_SAVED_SEARCHES, current_cursor, inbox, mark_read
+from property.search import AUTOCOMPLETE_LIMIT, autocomplete, search_queryset
+from property.similar import similar_listings
+from property.stats import DEFAULT_BUCKETS, MAX_BUCKETS, get_price_stats
+from property.wishlist import saved_property_ids
 from .permissions import PropertyOwnerPermission
 
 logger = logging.getLogger(__name__)
@@ -40,7 +55,7 @@ class PropertyViewSet(mixins.DestroyModelMixin,
 
     def perform_update(self, serializer):
         try:
-            serializer.save(owner=self.request.user)
+            serializer.save()
         except Exception as e:
             logger.error("Error in perform_update: %s", str(e), exc_info=True)
             raise ValidationError({"error": str(e)})
@@ -59,16 +74,18 @@ class PropertyViewSet(mixins.DestroyModelMixin,
             return Response(serializer.data, status=status.HTTP_200_OK)
         
 
-class PropertyListViewSet(mixins.ListModelMixin,
+@query_budget(5)
+class PropertyListViewSet(ConditionalListMixin,
+                        mixins.ListModelMixin,
                         mixins.RetrieveModelMixin,
                         viewsets.GenericViewSet):
     """Views set to list and retrieve properties"""
     permission_classes = [AllowAny]
     serializer_class = serializers.PropertySerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ['category', 'price', 'bedrooms', 'bathrooms', 'parking_spaces']
+    filter_backends = [DjangoFilterBackend, SearchFilter, StableOrderingFilter]
+    filterset_class = PropertyFilter
     search_fields = ['name', 'description', 'location']
-    ordering_fields = ['price', 'created_at']
+    ordering_fields = ['price', 'created_at', 'popularity']
     ordering = ['-created_at']
     queryset = Rent.objects.all()
 
@@ -82,19 +99,156 @@ class PropertyListViewSet(mixins.ListModelMixin,
         if property_id:
             queryset = queryset.filter(id=property_id)
         return super().filter_queryset(queryset)
+
+    def get_projection(self):
+        """Return the fields selected with ?fields= and ?omit=, or None for all"""
+        requested = self.request.query_params.get('fields')
+        omitted = self.request.query_params.get('omit')
+        if not requested and not omitted:
+            return None
+
+        available = [*serializers.PropertySerializer().fields, 'is_saved']
+        fields = [name for name in requested.split(',') if name] if requested else available
+        omit = [name for name in omitted.split(',') if name] if omitted else []
+        unknown = sorted(set(fields + omit) - set(available))
+        if unknown:
+            raise ValidationError({'fields': f"Unknown fields: {', '.join(unknown)}"})
+        return [name for name in available if name in fields and name not in omit]
+
+    def get_formats(self):
+        """Return the price and timestamp formats requested by the client"""
+        formats = {
+            'price_format': self.request.query_params.get('price_format', 'display'),
+            'timestamp_format': self.request.query_params.get('timestamp_format', 'display'),
+        }
+        if formats['price_format'] not in serializers.PRICE_FORMATS:
+            raise ValidationError({'price_format': f"Choose one of: {', '.join(serializers.PRICE_FORMATS)}"})
+        if formats['timestamp_format'] not in serializers.TIMESTAMP_FORMATS:
+            raise ValidationError({'timestamp_format': f"Choose one of: {', '.join(serializers.TIMESTAMP_FORMATS)}"})
+        return formats
+
+    def get_serializer_context(self):
+        """Pass the requested formats to the serializer"""
+        return {**super().get_serializer_context(), 'formats': self.get_formats()}
+
+    def get_saved_ids(self):
+        """Return the ids the current user has saved, or None for anonymous requests"""
+        if not self.request.user.is_authenticated:
+            return None
+        if not hasattr(self, '_saved_ids'):
+            self._saved_ids = saved_property_ids(self.request.user)
+        return self._saved_ids
+
+    def get_etag_parts(self):
+        """Make the ETag depend on the user's saved listings, popularity ranking and neighbours"""
+        parts = []
+        if self.action == 'trending' or 'popularity' in self.request.query_params.get('ordering', ''):
+            parts.append(popularity_version())
+        if self.action == 'similar':
+            parts.append(self.neighbors_built_at)
+        saved_ids = self.get_saved_ids()
+        if saved_ids is not None:
+            parts += [self.request.user.id, sorted(saved_ids)]
+        return parts
+
+    def documents_response(self, queryset):
+        """Respond with listing documents, flagging the ones the user has saved"""
+        fields = self.get_projection()
+        formats = self.get_formats()
+        saved_ids = self.get_saved_ids()
+        flag_saved = saved_ids is not None and (fields is None or 'is_saved' in fields)
+        drop_id = False
+        if fields is not None:
+            fields = [name for name in fields if name != 'is_saved']
+            if flag_saved and 'id' not in fields:
+                fields, drop_id = ['id', *fields], True
+
+        def build_response():
+            documents = get_documents(queryset, fields=fields, formats=formats, request=self.request)
+            if flag_saved:
+                for document in documents:
+                    property_id = document.pop('id') if drop_id else document['id']
+                    document['is_saved'] = property_id in saved_ids
+            return Response(documents, status=status.HTTP_200_OK)
+
+        return self.conditional_response(queryset, build_response)
+
+    # Cold cache: auth, saved ids, count, page ids and documents, plus the
+    # popularity version when ordering by popularity.
+    @query_budget(6)
+    def list(self, request, *args, **kwargs):
+        """List properties from the cached listing documents"""
+        return self.documents_response(self.filter_queryset(self.get_queryset()))
     
+    @query_budget(5)
     @action(detail=False, methods=['get'])
     def search(self, request):
         """Search for properties"""
         query = request.query_params.get('query', None)
         if query:
-            properties = Rent.objects.filter(name__icontains=query)
+            properties = search_queryset(query)
         else:
             properties = Rent.objects.all()
-        
-        serializer = self.get_serializer(properties, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+
+        return self.documents_response(properties)
+
+    # The listing list's queries plus the popularity version and the
+    # trending ids.
+    @query_budget(7)
+    @action(detail=False, methods=['get'])
+    def trending(self, request):
+        """Most popular listings with recent wishlist saves or messages"""
+        try:
+            limit = min(max(int(request.query_params.get('limit', TRENDING_LIMIT)), 1), TRENDING_LIMIT)
+        except ValueError:
+            limit = TRENDING_LIMIT
+        return self.documents_response(trending_queryset(limit))
+
+    @query_budget(6)
+    @action(detail=True, methods=['get'])
+    def similar(self, request, pk=None):
+        """Listings most similar to this one, closest first"""
+        properties, self.neighbors_built_at = similar_listings(pk)
+        if self.neighbors_built_at is None:
+            get_object_or_404(Rent, pk=pk)
+        return self.documents_response(properties)
+
+    @query_budget(2)
+    @action(detail=False, methods=['get'], url_path='price-stats')
+    def price_stats(self, request):
+        """Price range, percentiles and histogram per category"""
+        try:
+            buckets = min(max(int(request.query_params.get('buckets', DEFAULT_BUCKETS)), 1), MAX_BUCKETS)
+        except ValueError:
+            buckets = DEFAULT_BUCKETS
+        queryset = self.filter_queryset(self.get_queryset())
+        stats = get_price_stats(queryset, request.query_params.urlencode(), buckets)
+        return Response(stats, status=status.HTTP_200_OK)
+
+    @query_budget(4)
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """Suggest listing names and locations similar to the query"""
+        query = request.query_params.get('query', '')
+        try:
+            limit = min(int(request.query_params.get('limit', AUTOCOMPLETE_LIMIT)), AUTOCOMPLETE_LIMIT)
+        except ValueError:
+            limit = AUTOCOMPLETE_LIMIT
+        return Response(autocomplete(query, max(limit, 1)), status=status.HTTP_200_OK)
+
+
+@query_budget(4)
+class OwnerDashboardViewSet(viewsets.GenericViewSet):
+    """Listings owned by the current user with engagement counts"""
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(responses=OpenApiTypes.OBJECT)
+    def list(self, request):
+        """Return the user's listings with wishlist and contact counts"""
+        return Response(owner_dashboard(request.user, request), status=status.HTTP_200_OK)
+
     
+@query_budget(3)
 class WishlistViewSet(viewsets.GenericViewSet,
                               mixins.ListModelMixin,
                               mixins.DestroyModelMixin,
@@ -104,14 +258,18 @@ class WishlistViewSet(viewsets.GenericViewSet,
     
     def get_queryset(self):
         """Get all wishlist items for the current user"""
-        return Wishlist.objects.filter(user=self.request.user)
+        return Wishlist.objects.filter(user=self.request.user).select_related('property')
     
     def list(self, request):
         """List all wishlist items for the current user"""
-        wishlist = Wishlist.objects.filter(user=request.user)
+        wishlist = self.get_queryset()
         serializer = serializers.WishListSerializer(wishlist, many=True)
         return Response(serializer.data)
 
+    # Auth, the listing, insert and re-read, the change-log and popularity
+    # rows; an Idempotency-Key adds its claim, re-read and stored response.
+    @query_budget(9)
+    @idempotent
     def create(self, request):
         """Add a property to the wishlist"""
         property_id = request.data.get("property_id")
@@ -120,13 +278,19 @@ class WishlistViewSet(viewsets.GenericViewSet,
         except Rent.DoesNotExist:
             return Response({"detail": "Property not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        wishlist_item, created = Wishlist.objects.get_or_create(user=request.user, property=property_obj)
+        wishlist_item, created = create_once(
+            Wishlist(user=request.user, property=property_obj), user=request.user, property=property_obj,
+        )
         if created:
+            # Reuse the listing fetched above instead of loading it again.
+            wishlist_item.property = property_obj
             serializer = serializers.WishListSerializer(wishlist_item)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         else:
             return Response({"detail": "Item already in wishlist."}, status=status.HTTP_400_BAD_REQUEST)
 
+    # Auth, the item, the delete and its change-log row.
+    @query_budget(4)
     def destroy(self, request, pk=None):
         """Remove item from wishlist"""
         try:
@@ -149,21 +313,97 @@ class ContactViewSet(mixins.CreateModelMixin,
         """Get all contact messages"""
         return Contact.objects.all()
 
+    @idempotent
     def create(self, request):
         """Create a new contact message"""
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        contact = serializer.save()
+        key = getattr(request, 'idempotency_key', None)
+        if key is None:
+            contact = serializer.save()
+        else:
+            # A retry after the stored response has expired still finds the row.
+            contact, created = create_once(
+                Contact(idempotency_key=key, **serializer.validated_data), idempotency_key=key,
+            )
+            if not created:
+                return Response(self.get_serializer(contact).data, status=status.HTTP_200_OK)
 
         logger.info(f"Contact message created: {contact.rent.contact_email}")
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(self.get_serializer(contact).data, status=status.HTTP_201_CREATED)
     
 
+@query_budget(2)
 class ContactDetailViewSet(mixins.ListModelMixin,
                            viewsets.GenericViewSet):
     """ Viewset to handle contact form submissions"""
     permission_classes = [AllowAny]
     serializer_class = serializers.ContactSerializer 
-    queryset = Contact.objects.all()
+    queryset = Contact.objects.select_related('rent').order_by('-created_at')
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = ContactFilter
 
-    
+
+@query_budget(4)
+class SavedSearchViewSet(mixins.ListModelMixin,
+                         mixins.CreateModelMixin,
+                         mixins.RetrieveModelMixin,
+                         mixins.UpdateModelMixin,
+                         mixins.DestroyModelMixin,
+                         viewsets.GenericViewSet):
+    """Manage the current user's saved searches"""
+    permission_classes = [IsAuthenticated]
+    serializer_class = serializers.SavedSearchSerializer
+
+    def get_queryset(self):
+        """Get the current user's saved searches"""
+        return SavedSearch.objects.filter(user=self.request.user).order_by('-created_at')
+
+    def perform_create(self, serializer):
+        """Save the search, matching only listings changed from now on"""
+        if self.get_queryset().count() >= MAX_SAVED_SEARCHES:
+            raise ValidationError({'detail': f'You can save at most {MAX_SAVED_SEARCHES} searches.'})
+        serializer.save(user=self.request.user, last_change_id=current_cursor())
+
+
+@query_budget(4)
+class SavedSearchInboxViewSet(viewsets.GenericViewSet):
+    """Listings that matched the current user's saved searches"""
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(responses=OpenApiTypes.OBJECT)
+    def list(self, request):
+        """Return the newest matches, only unread ones with ?unread=true"""
+        unread_only = request.query_params.get('unread', '').lower() in ('1', 'true')
+        try:
+            limit = min(max(int(request.query_params.get('limit', INBOX_LIMIT)), 1), INBOX_LIMIT)
+        except ValueError:
+            limit = INBOX_LIMIT
+        return Response(inbox(request.user, unread_only, limit, request), status=status.HTTP_200_OK)
+
+    @extend_schema(request=OpenApiTypes.OBJECT, responses=OpenApiTypes.OBJECT)
+    @action(detail=False, methods=['post'])
+    def read(self, request):
+        """Mark the matches listed in "ids", or all of them, as read"""
+        ids = request.data.get('ids')
+        if ids is not None and not (isinstance(ids, list) and all(isinstance(pk, int) for pk in ids)):
+            raise ValidationError({'ids': 'Must be a list of match ids.'})
+        return Response({'marked': mark_read(request.user, ids)}, status=status.HTTP_200_OK)
+
+
+class ChangeFeedViewSet(viewsets.GenericViewSet):
+    """Incremental feed of listing, wishlist and contact changes"""
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(responses=OpenApiTypes.OBJECT)
+    def list(self, request):
+        """Return changes after ?since=, oldest first"""
+        try:
+            since = max(int(request.query_params.get('since', 0)), 0)
+            limit = min(max(int(request.query_params.get('limit', DEFAULT_LIMIT)), 1), MAX_LIMIT)
+        except ValueError:
+            raise ValidationError({'since': 'Cursor and limit must be integers.'})
+        model = request.query_params.get('model')
+        if model and model not in TRACKED_MODELS.values():
+            raise ValidationError({'model': f"Choose one of: {', '.join(TRACKED_MODELS.values())}"})
+        return Response(get_changes(since, limit, model, request), status=status.HTTP_200_OK)
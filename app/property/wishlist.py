@@ -0,0 +1,44 @@
+"""
+Cached wishlist membership for the property app.
+
+Each user's saved ids are cached under a per-user version. A wishlist change
+moves the user to a new version after it commits, so a read that sees the new
+version always sees the change; a read racing with the write can only fill
+the old version's entry, which is never read again.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+from coreapp.models import Wishlist
+
+SAVED_IDS_TIMEOUT = 60 * 60
+
+
+def saved_ids_version_key(user_id):
+    """Return the cache key for a user's saved-ids version."""
+    return f'wishlist_version_{user_id}'
+
+
+def saved_ids_key(user_id, version):
+    """Return the cache key for a version of a user's saved property ids."""
+    return f'wishlist_ids_{user_id}_{version}'
+
+
+def saved_property_ids(user):
+    """Return the set of property ids the user has saved, cached per user."""
+    version = cache.get_or_set(saved_ids_version_key(user.id), time.time_ns, SAVED_IDS_TIMEOUT)
+    key = saved_ids_key(user.id, version)
+    ids = cache.get(key)
+    if ids is None:
+        ids = set(Wishlist.objects.filter(user=user).values_list('property_id', flat=True))
+        cache.set(key, ids, SAVED_IDS_TIMEOUT)
+    return ids
+
+
+def invalidate_saved_property_ids(user_id):
+    """Move the user to a new saved-ids version once the change is committed."""
+    transaction.on_commit(
+        lambda: cache.set(saved_ids_version_key(user_id), time.time_ns(), SAVED_IDS_TIMEOUT)
+    )
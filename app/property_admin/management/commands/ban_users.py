@@ -0,0 +1,46 @@
+"""
+Ban users in bulk from the command line.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date, parse_datetime
+
+from property_admin.moderation import ban_users, users_matching
+
+
+class Command(BaseCommand):
+    help = 'Deactivate users by id or filter and revoke their refresh tokens.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ids', type=int, nargs='+')
+        parser.add_argument('--email-domain')
+        parser.add_argument('--joined-after')
+        parser.add_argument('--joined-before')
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        joined_after = self._parse_date(options['joined_after'])
+        joined_before = self._parse_date(options['joined_before'])
+        if not any([options['ids'], options['email_domain'], joined_after, joined_before]):
+            raise CommandError('Pass --ids or at least one filter.')
+
+        users = users_matching(
+            ids=options['ids'],
+            email_domain=options['email_domain'],
+            joined_after=joined_after,
+            joined_before=joined_before,
+        )
+        if options['dry_run']:
+            count = users.filter(is_active=True).count()
+            self.stdout.write(f'{count} users would be banned.')
+            return
+
+        banned = ban_users(users)
+        self.stdout.write(self.style.SUCCESS(f'Banned {len(banned)} users.'))
+
+    def _parse_date(self, value):
+        if value is None:
+            return None
+        parsed = parse_datetime(value) or parse_date(value)
+        if parsed is None:
+            raise CommandError(f'Invalid datetime: {value}')
+        return parsed
@@ -0,0 +1,37 @@
+"""
+Report formatting run in worker processes.
+
+Nothing here imports Django, so spawned pool processes start quickly and
+never touch the database. openpyxl is imported only by the XLSX conversion:
+this module is loaded with the URLconf in every web worker, and openpyxl
+alone takes a large share of that start-up.
+"""
+import csv
+import io
+from importlib.util import find_spec
+
+
+def xlsx_available():
+    """Return whether openpyxl is installed, without importing it."""
+    return find_spec('openpyxl') is not None
+
+
+def format_csv_rows(rows):
+    """Render a chunk of rows as CSV text."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+def csv_to_xlsx(csv_path, xlsx_path, sheet_title):
+    """Convert a CSV file into a single-sheet workbook, streaming row by row."""
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise RuntimeError('openpyxl is required for Excel reports.')
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=sheet_title)
+    with open(csv_path, newline='', encoding='utf-8') as source:
+        for row in csv.reader(source):
+            sheet.append(row)
+    workbook.save(xlsx_path)
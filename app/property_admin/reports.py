@@ -0,0 +1,163 @@
+"""
+Background report generation for admins.
+
+A job runs on a small thread pool: the thread streams rows from the database
+with a server-side cursor (``QuerySet.iterator``) and hands chunks to a
+process pool that formats them, so neither the request worker nor the
+thread's GIL is held by CSV/XLSX encoding. Files are written under
+``MEDIA_ROOT/reports/``.
+
+Jobs live only in the worker process that accepted them, so a worker restart
+loses them; ``reap_stale_reports`` marks such jobs failed.
+"""
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import suppress
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from coreapp.models import Contact, Rent, ReportJob, User, Wishlist
+from property_admin.report_formats import csv_to_xlsx, format_csv_rows
+
+logger = logging.getLogger(__name__)
+
+REPORTS = {
+    'users': (
+        lambda: User.objects.order_by('id'),
+        ['id', 'email', 'username', 'first_name', 'last_name', 'is_active', 'is_staff', 'date_joined'],
+    ),
+    'listings': (
+        lambda: Rent.objects.order_by('id'),
+        ['id', 'name', 'owner__email', 'price', 'location', 'property_type', 'category',
+         'bedrooms', 'bathrooms', 'is_active', 'created_at'],
+    ),
+    'wishlist': (
+        lambda: Wishlist.objects.order_by('id'),
+        ['id', 'user__email', 'property_id', 'property__name', 'created_at'],
+    ),
+    'contacts': (
+        lambda: Contact.objects.order_by('id'),
+        ['id', 'rent_id', 'rent__name', 'message', 'created_at'],
+    ),
+}
+MAX_PENDING_CHUNKS = 4
+
+_lock = threading.Lock()
+_threads = None
+_processes = None
+
+
+def _python_executable():
+    """Return the interpreter that spawned pool processes run.
+
+    Under uWSGI ``sys.executable`` is the uwsgi binary, which cannot run the
+    spawn bootstrap, so use the ``python`` of the environment uWSGI runs in.
+    """
+    try:
+        import uwsgi  # noqa: F401 (only importable inside uWSGI)
+    except ImportError:
+        return sys.executable
+    return os.path.join(sys.prefix, 'bin', 'python')
+
+
+def _pools():
+    """Create the pools on first use; processes are spawned, never forked from a worker."""
+    global _threads, _processes
+    with _lock:
+        if _threads is None:
+            context = multiprocessing.get_context('spawn')
+            context.set_executable(_python_executable())
+            _threads = ThreadPoolExecutor(settings.REPORT_THREAD_WORKERS, thread_name_prefix='report')
+            _processes = ProcessPoolExecutor(settings.REPORT_PROCESS_WORKERS, mp_context=context)
+    return _threads, _processes
+
+
+def start_report(job):
+    """Queue a job to run once the transaction that created it commits."""
+    transaction.on_commit(lambda: _pools()[0].submit(run_report, job.id))
+
+
+def reap_stale_reports():
+    """Fail jobs still pending or running after ``REPORT_STALE_SECONDS``; return how many.
+
+    Such a job was lost with the worker that ran it (reload, crash or
+    ``max-requests`` recycle) and would otherwise stay pending forever.
+    """
+    now = timezone.now()
+    return ReportJob.objects.filter(
+        status__in=[ReportJob.PENDING, ReportJob.RUNNING],
+        created_at__lt=now - timedelta(seconds=settings.REPORT_STALE_SECONDS),
+    ).update(status=ReportJob.FAILED, error='Interrupted; request the report again.', finished_at=now)
+
+
+def report_filename(job):
+    """Return the path of a job's file relative to MEDIA_ROOT."""
+    return f'reports/{job.kind}-{job.id}-{job.created_at:%Y%m%d%H%M%S}.{job.format}'
+
+
+def run_report(job_id):
+    """Generate a report file and record the outcome on the job."""
+    close_old_connections()
+    job = ReportJob.objects.get(id=job_id)
+    # A job reaped while it waited in the queue is not run.
+    if not ReportJob.objects.filter(id=job_id, status=ReportJob.PENDING).update(
+            status=ReportJob.RUNNING, started_at=timezone.now()):
+        connection.close()
+        return
+    name = report_filename(job)
+    path = os.path.join(settings.MEDIA_ROOT, name)
+    csv_path = path if job.format == 'csv' else path[:-len(job.format)] + 'csv.tmp'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        row_count = write_csv(job.kind, csv_path)
+        if job.format == 'xlsx':
+            _pools()[1].submit(csv_to_xlsx, csv_path, path, job.kind).result()
+        ReportJob.objects.filter(id=job_id).update(
+            status=ReportJob.DONE, file=name, row_count=row_count, finished_at=timezone.now(),
+        )
+    except Exception as e:
+        logger.error("Report job %s failed: %s", job_id, e, exc_info=True)
+        ReportJob.objects.filter(id=job_id).update(status=ReportJob.FAILED, error=str(e), finished_at=timezone.now())
+        with suppress(FileNotFoundError):
+            os.remove(path)
+    finally:
+        if csv_path != path:
+            with suppress(FileNotFoundError):
+                os.remove(csv_path)
+        connection.close()
+
+
+def write_csv(kind, path):
+    """Stream a report's rows to a CSV file, formatting chunks in the process pool."""
+    queryset, columns = REPORTS[kind]
+    processes = _pools()[1]
+    chunk_size = settings.REPORT_CHUNK_SIZE
+    pending = deque()
+    row_count = 0
+
+    with open(path, 'w', newline='', encoding='utf-8') as target:
+        target.write(format_csv_rows([columns]))
+        chunk = []
+        for row in queryset().values_list(*columns).iterator(chunk_size=chunk_size):
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                pending.append(processes.submit(format_csv_rows, chunk))
+                row_count += len(chunk)
+                chunk = []
+                # Keep a bounded number of chunks in flight and write in order.
+                while len(pending) >= MAX_PENDING_CHUNKS:
+                    target.write(pending.popleft().result())
+        if chunk:
+            pending.append(processes.submit(format_csv_rows, chunk))
+            row_count += len(chunk)
+        while pending:
+            target.write(pending.popleft().result())
+    return row_count
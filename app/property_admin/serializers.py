@@ -8,6 +8,9 @@ from django.utils.translation import gettext_lazy as _
 
 from rest_framework import serializers
 
+from coreapp.models import ReportJob
+from property_admin.report_formats import xlsx_available
+
 User = get_user_model()
 
 class AdminUserSerializer(serializers.ModelSerializer):
@@ -145,4 +148,36 @@ class LogOutSerializer(serializers.Serializer):
         write_only=True,
         required=True,
         style={'input_type': 'text'},
-    )
\ No newline at end of file
+    )
+
+
+class BulkBanSerializer(serializers.Serializer):
+    """Serializer for selecting users to ban in bulk."""
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, max_length=10000)
+    email_domain = serializers.CharField(required=False)
+    joined_after = serializers.DateTimeField(required=False)
+    joined_before = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        """Require at least one selector so a ban never targets everyone."""
+        if not any(attrs.values()):
+            raise serializers.ValidationError(
+                {'detail': _('Provide ids or at least one filter.')},
+                code='empty_selection'
+            )
+        return attrs
+
+
+class ReportJobSerializer(serializers.ModelSerializer):
+    """Serializer for requesting a report and reading its status."""
+
+    class Meta:
+        model = ReportJob
+        fields = ('id', 'kind', 'format', 'status', 'row_count', 'error', 'created_at', 'started_at', 'finished_at')
+        read_only_fields = ('id', 'status', 'row_count', 'error', 'created_at', 'started_at', 'finished_at')
+
+    def validate_format(self, value):
+        """Excel output needs openpyxl to be installed."""
+        if value == 'xlsx' and not xlsx_available():
+            raise serializers.ValidationError(_('Excel reports are not available on this server.'))
+        return value
@@ -0,0 +1,98 @@
+"""
+Tests for admin report exports.
+"""
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from coreapp.models import ReportJob, User
+from property_admin.reports import reap_stale_reports, report_filename, run_report
+
+REPORTS_URL = '/api/property-admin/reports/'
+
+
+class ReportAccessTests(TestCase):
+    """Admins only see and download their own exports."""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='pw')
+        other = User.objects.create_superuser(username='other', email='other@example.com', password='pw')
+        self.job = ReportJob.objects.create(requested_by=other, kind='users', status=ReportJob.DONE)
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(self.admin)}'}
+
+    def test_other_admins_job_is_not_found(self):
+        for path in (f'{REPORTS_URL}{self.job.id}/', f'{REPORTS_URL}{self.job.id}/download/'):
+            with self.subTest(path=path):
+                self.assertEqual(self.client.get(path, **self.auth).status_code, 404)
+
+    def test_list_shows_own_jobs(self):
+        own = ReportJob.objects.create(requested_by=self.admin, kind='users')
+        response = self.client.get(REPORTS_URL, **self.auth)
+        self.assertEqual([job['id'] for job in response.json()], [own.id])
+
+
+class ReapStaleReportsTests(TestCase):
+    """Jobs lost with their worker are failed instead of staying pending."""
+
+    def test_only_old_unfinished_jobs_are_reaped(self):
+        old = timezone.now() - timedelta(days=1)
+        stale = [ReportJob.objects.create(kind='users', status=status) for status in (ReportJob.PENDING, ReportJob.RUNNING)]
+        done = ReportJob.objects.create(kind='users', status=ReportJob.DONE)
+        fresh = ReportJob.objects.create(kind='users')
+        ReportJob.objects.filter(id__in=[job.id for job in stale] + [done.id]).update(created_at=old)
+
+        self.assertEqual(reap_stale_reports(), 2)
+        self.assertEqual(set(ReportJob.objects.filter(status=ReportJob.FAILED).values_list('id', flat=True)),
+                         {job.id for job in stale})
+        fresh.refresh_from_db()
+        self.assertEqual(fresh.status, ReportJob.PENDING)
+
+    def test_reaped_job_is_not_run(self):
+        job = ReportJob.objects.create(kind='users', status=ReportJob.FAILED)
+        with mock.patch('property_admin.reports.connection'), \
+                mock.patch('property_admin.reports.close_old_connections'), \
+                mock.patch('property_admin.reports.write_csv') as write_csv:
+            run_report(job.id)
+        write_csv.assert_not_called()
+
+
+@mock.patch('property_admin.reports.connection')
+@mock.patch('property_admin.reports.close_old_connections')
+class RunReportTests(TestCase):
+    """A failed job leaves no files behind."""
+
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media.cleanup)
+        override = override_settings(MEDIA_ROOT=self.media.name)
+        override.enable()
+        self.addCleanup(override.disable)
+        executor = ThreadPoolExecutor(1)
+        self.addCleanup(executor.shutdown)
+        pools = mock.patch('property_admin.reports._pools', return_value=(executor, executor))
+        pools.start()
+        self.addCleanup(pools.stop)
+
+    def test_failed_xlsx_removes_temporary_csv(self, close_old_connections, connection):
+        job = ReportJob.objects.create(kind='users', format='xlsx')
+        with mock.patch('property_admin.reports.csv_to_xlsx', side_effect=RuntimeError('boom')), \
+                self.assertLogs('property_admin.reports', 'ERROR'):
+            run_report(job.id)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ReportJob.FAILED)
+        self.assertEqual(os.listdir(os.path.join(self.media.name, 'reports')), [])
+
+    def test_csv_report_is_written(self, close_old_connections, connection):
+        User.objects.create_user(username='user', email='user@example.com', password='pw')
+        job = ReportJob.objects.create(kind='users')
+        run_report(job.id)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ReportJob.DONE)
+        self.assertEqual(job.row_count, 1)
+        self.assertEqual(os.listdir(os.path.join(self.media.name, 'reports')), [os.path.basename(report_filename(job))])
@@ -18,5 +18,9 @@ urlpatterns: List[URLPattern] = [
     path('token/refresh/', TokenRefreshView.as_view(), name='admin_token_refresh'),
     path('stats/', views.AdminListView.as_view(), name='list_of_users'),
     path('user/', views.AdminListView.as_view(), name='admin_user_detail'),
-    path('users/<str:pk>/', views.BanUserView.as_view(), name='ban_user'),
+    path('users/ban/', views.BulkBanUserView.as_view(), name='bulk_ban_users'),
+    path('users/<int:pk>/', views.BanUserView.as_view(), name='ban_user'),
+    path('reports/', views.ReportJobListCreateView.as_view(), name='reports'),
+    path('reports/<int:pk>/', views.ReportJobDetailView.as_view(), name='report_detail'),
+    path('reports/<int:pk>/download/', views.ReportDownloadView.as_view(), name='report_download'),
     ]
\ No newline at end of file
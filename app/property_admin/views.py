@@ -1,19 +1,32 @@
 """
 Viewset for the admin page
 """
+import os
 from typing import Any
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework_simplejwt.views import TokenObtainPairView
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.throttling import UserRateThrottle
 from rest_framework import serializers
 from django.shortcuts import get_object_or_404
+from django_filters.rest_framework import DjangoFilterBackend
 
-from coreapp.models import User
-from property_admin.serializers import AdminUserSerializer, AuthTokenSerializer, LogOutSerializer
+from coreapp.models import ReportJob, User
+from ecommerce.media import send_media_file
+from ecommerce.openapi import OpenApiTypes, extend_schema
+from property_admin.moderation import ban_users, users_matching
+from property_admin.reports import reap_stale_reports, start_report
+from property_admin.serializers import (
+    AdminUserSerializer,
+    AuthTokenSerializer,
+    BulkBanSerializer,
+    LogOutSerializer,
+    ReportJobSerializer,
+)
+from user.pagination import UserCursorPagination
+from user.tokens import CachedRefreshToken
 
 
 class CreateAdminUserView(generics.CreateAPIView):
@@ -41,7 +54,7 @@ class UserAdminLoginView(TokenObtainPairView):
             admin = serializer.validated_data['user']
             
             # Generate tokens
-            refresh = RefreshToken.for_user(admin)
+            refresh = CachedRefreshToken.for_user(admin)
             
             # Get user data using UserSerializer
             user_data = AdminUserSerializer(admin).data
@@ -87,7 +100,7 @@ class UserAdminLogoutView(generics.GenericAPIView):
                 )
             
             # Blacklist the refresh token
-            RefreshToken(refresh_token).blacklist()
+            CachedRefreshToken(refresh_token).blacklist()
             
             return Response({'detail': 'Successfully logged out'}, status=status.HTTP_205_RESET_CONTENT)
         except Exception as e:
@@ -97,6 +110,9 @@ class AdminListView(generics.ListAPIView):
     """List all admin users."""
     queryset = User.objects.all()
     serializer_class = AdminUserSerializer
+    pagination_class = UserCursorPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['is_staff', 'is_active']
     
     def get(self, request, *args, **kwargs):
         if request.path.endswith('/stats/'):
@@ -114,11 +130,15 @@ class AdminListView(generics.ListAPIView):
     
     def list(self, request):
         """Get all users and admin details"""
-        user = self.get_queryset().filter(is_staff=True)
-        if not user:
+        users = self.filter_queryset(self.get_queryset())
+        if 'is_staff' not in request.query_params:
+            users = users.filter(is_staff=True)
+        page = self.paginate_queryset(users)
+        # An empty first page means no rows match; no separate COUNT is needed.
+        if not page and not request.query_params.get(self.paginator.cursor_query_param):
             return Response({'detail': 'No users found'}, status=status.HTTP_404_NOT_FOUND)
-        serializer = self.get_serializer(user, many=True)
-        return Response(serializer.data)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
     
 class BanUserView(generics.UpdateAPIView):
     """Ban a user by setting their is_active field to False."""
@@ -129,13 +149,80 @@ class BanUserView(generics.UpdateAPIView):
     lookup_field = 'id'
     
     def update(self, request, *args, **kwargs):
-        user = get_object_or_404(User, id=kwargs.get('id'))
+        user = get_object_or_404(User, id=kwargs.get('pk'))
+        # Same safeguards as the bulk ban: never superusers or the caller.
+        users = users_matching(ids=[user.id]).exclude(id=request.user.id)
+        if not users.exists():
+            return Response({'detail': 'This user cannot be banned.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        user.is_active = False
-        user.save()
+        banned = ban_users(users)
 
         return Response({
             'id': user.id,
-            'is_active': user.is_active,
-            'detail': 'User banned successfully'
-        }, status=status.HTTP_200_OK)
\ No newline at end of file
+            'is_active': False,
+            'banned': len(banned),
+            'detail': 'User banned successfully' if banned else 'User was already banned'
+        }, status=status.HTTP_200_OK)
+
+
+class BulkBanUserView(generics.GenericAPIView):
+    """Ban many users at once by id list or filter."""
+    serializer_class = BulkBanSerializer
+    permission_classes = [IsAdminUser]
+    authentication_classes = [JWTAuthentication]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        users = users_matching(**serializer.validated_data).exclude(id=request.user.id)
+        banned = ban_users(users)
+
+        return Response({
+            'banned': len(banned),
+            'ids': banned,
+            'detail': 'Users banned successfully'
+        }, status=status.HTTP_200_OK)
+
+
+class ReportJobQuerysetMixin:
+    """Limit report views to the current admin's exports."""
+
+    def get_queryset(self):
+        # Jobs lost with a restarted worker would otherwise show as pending forever.
+        reap_stale_reports()
+        return ReportJob.objects.filter(requested_by=self.request.user).order_by('-id')
+
+
+class ReportJobListCreateView(ReportJobQuerysetMixin, generics.ListCreateAPIView):
+    """Request a CSV/XLSX export and list the current admin's exports."""
+    serializer_class = ReportJobSerializer
+    permission_classes = [IsAdminUser]
+    authentication_classes = [JWTAuthentication]
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = serializer.save(requested_by=request.user)
+        start_report(job)
+        return Response(self.get_serializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+class ReportJobDetailView(ReportJobQuerysetMixin, generics.RetrieveAPIView):
+    """Show the status of an export."""
+    serializer_class = ReportJobSerializer
+    permission_classes = [IsAdminUser]
+    authentication_classes = [JWTAuthentication]
+
+
+class ReportDownloadView(ReportJobQuerysetMixin, generics.GenericAPIView):
+    """Download a finished export."""
+    permission_classes = [IsAdminUser]
+    authentication_classes = [JWTAuthentication]
+
+    @extend_schema(responses={(200, 'application/octet-stream'): OpenApiTypes.BINARY, 409: OpenApiTypes.OBJECT})
+    def get(self, request, *args, **kwargs):
+        job = self.get_object()
+        if job.status != ReportJob.DONE:
+            return Response({'detail': f'Report is {job.status}.'}, status=status.HTTP_409_CONFLICT)
+        return send_media_file(job.file.name, os.path.basename(job.file.name))
@@ -0,0 +1,49 @@
+"""
+Delete expired refresh tokens from the token blacklist tables.
+
+Every login and rotation adds an ``OutstandingToken`` row, and every logout a
+``BlacklistedToken`` row, which nothing else removes. This walks outstanding
+tokens in primary-key order, deletes them in batches (the cascade takes their
+blacklist entries along) and stops at the first token that has not expired.
+An expired token fails validation on its own, so deleting it revokes nothing.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+
+class Command(BaseCommand):
+    help = 'Delete expired outstanding and blacklisted tokens in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        now = timezone.now()
+        last_id = 0
+        deleted = 0
+
+        # Every token gets the same lifetime, so expiry follows the primary
+        # key: walk it in index range scans and stop at the first token that
+        # is still live. expires_at has no index, so filtering on it instead
+        # would scan every remaining row to find the end.
+        while True:
+            rows = list(
+                OutstandingToken.objects.filter(id__gt=last_id)
+                .order_by('id')
+                .values_list('id', 'expires_at')[:batch_size]
+            )
+            live = next((index for index, (_, expires_at) in enumerate(rows) if expires_at > now), len(rows))
+            ids = [token_id for token_id, _ in rows[:live]]
+            if ids:
+                with transaction.atomic():
+                    # The cascade removes the matching blacklisted rows as well.
+                    OutstandingToken.objects.filter(id__in=ids).delete()
+                last_id = ids[-1]
+                deleted += len(ids)
+            if live < len(rows) or len(rows) < batch_size:
+                break
+
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired tokens.'))
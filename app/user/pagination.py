@@ -0,0 +1,16 @@
+"""
+Pagination for the user API.
+"""
+from rest_framework.pagination import CursorPagination
+
+
+class UserCursorPagination(CursorPagination):
+    """Keyset pagination over users, newest first.
+
+    Each page is an index range scan on ``id`` (or ``(is_staff, id)`` /
+    ``(is_active, id)`` when filtered), so deep pages cost the same as the first.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = '-id'
@@ -1,13 +1,16 @@
 """
 Serializers for the User api.
 """
-from drf_spectacular.utils import extend_schema_serializer
 from django.contrib.auth import authenticate, get_user_model
 from django.contrib.auth.password_validation import validate_password
 from django.core.cache import cache
 from django.utils.translation import gettext_lazy as _
 
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer as BaseTokenRefreshSerializer
+
+from ecommerce.openapi import extend_schema_serializer
+from user.tokens import CachedRefreshToken
 
 User = get_user_model()
 
@@ -142,3 +145,8 @@ class LogOutSerializer(serializers.Serializer):
         required=True,
         style={'input_type': 'text'},
     )
+
+
+class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    """Serializer for refreshing tokens with the cached revocation check."""
+    token_class = CachedRefreshToken
@@ -0,0 +1,15 @@
+"""
+Signal handlers for the user app.
+"""
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from user.tokens import mark_revoked
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def cache_revoked_token(sender, instance, created, **kwargs):
+    """Add newly blacklisted tokens to the revocation cache."""
+    if created:
+        mark_revoked(instance.token.jti, instance.token.expires_at)
@@ -0,0 +1,75 @@
+"""
+Refresh tokens with a cached revocation check.
+
+The shared cache holds the revocation state of every refresh token issued
+through ``CachedRefreshToken``: ``False`` when it is issued, ``True`` once it
+is revoked. Only a token missing from the cache (evicted, or issued before
+this was deployed) is looked up in the blacklist table.
+"""
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+
+def revocation_key(jti):
+    """Return the cache key holding a token's revocation state."""
+    return f'token_revoked_{jti}'
+
+
+def _lifetime(expires_at):
+    """Return the seconds until ``expires_at``."""
+    return int((expires_at - timezone.now()).total_seconds())
+
+
+def mark_revoked(jti, expires_at):
+    """Remember a revoked token until it would have expired anyway."""
+    timeout = _lifetime(expires_at)
+    if timeout > 0:
+        cache.set(revocation_key(jti), True, timeout)
+
+
+def mark_not_revoked(jti, expires_at):
+    """Remember that a token is not revoked.
+
+    ``add`` never overwrites, so a revocation recorded first always wins, and
+    a later revocation replaces this entry with ``mark_revoked``.
+    """
+    timeout = _lifetime(expires_at)
+    if timeout > 0:
+        cache.add(revocation_key(jti), False, timeout)
+
+
+class CachedRefreshToken(RefreshToken):
+    """Refresh token that checks the revocation cache before the blacklist table."""
+
+    @classmethod
+    def for_user(cls, user):
+        """Issue a token and record it as not revoked."""
+        token = super().for_user(user)
+        mark_not_revoked(token[api_settings.JTI_CLAIM], datetime_from_epoch(token['exp']))
+        return token
+
+    def outstand(self):
+        """Register a rotated token and record it as not revoked."""
+        outstanding = super().outstand()
+        mark_not_revoked(self.payload[api_settings.JTI_CLAIM], datetime_from_epoch(self.payload['exp']))
+        return outstanding
+
+    def check_blacklist(self):
+        """Raise TokenError if the token has been revoked."""
+        jti = self.payload[api_settings.JTI_CLAIM]
+        expires_at = datetime_from_epoch(self.payload['exp'])
+        revoked = cache.get(revocation_key(jti))
+        if revoked is None:
+            revoked = BlacklistedToken.objects.filter(token__jti=jti).exists()
+            if revoked:
+                mark_revoked(jti, expires_at)
+            else:
+                mark_not_revoked(jti, expires_at)
+        if revoked:
+            raise TokenError(_('Token is blacklisted'))
@@ -11,7 +11,6 @@ from typing import Any
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework_simplejwt.views import TokenObtainPairView
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.throttling import UserRateThrottle
@@ -19,9 +18,12 @@ from rest_framework import serializers
 import logging
 import traceback
 from rest_framework.exceptions import ValidationError
+from django_filters.rest_framework import DjangoFilterBackend
 
 from coreapp.models import User
 from user.serializers import UserSerializer, AuthTokenSerializer, LogOutSerializer
+from user.pagination import UserCursorPagination
+from user.tokens import CachedRefreshToken
 
 
 logger = logging.getLogger(__name__)
@@ -72,7 +74,7 @@ class UserLoginView(TokenObtainPairView):
             user = serializer.validated_data['user']
             
             # Generate tokens
-            refresh = RefreshToken.for_user(user)
+            refresh = CachedRefreshToken.for_user(user)
             
             # Get user data using UserSerializer
             user_data = UserSerializer(user).data
@@ -127,7 +129,7 @@ class UserLogoutView(generics.GenericAPIView):
                 )
             
             # Blacklist the refresh token
-            RefreshToken(refresh_token).blacklist()
+            CachedRefreshToken(refresh_token).blacklist()
             
             return Response({'detail': 'Successfully logged out'}, status=status.HTTP_205_RESET_CONTENT)
         except Exception as e:
@@ -156,6 +158,9 @@ class UserListView(generics.ListAPIView):
     """
     serializer_class = UserSerializer
     permission_classes = [AllowAny]
+    pagination_class = UserCursorPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['is_staff', 'is_active']
     queryset = User.objects.all()
     
     
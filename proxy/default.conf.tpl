@@ -1,13 +1,46 @@
+uwsgi_cache_path /tmp/nginx-api-cache levels=1:2 keys_zone=api_cache:10m max_size=100m inactive=10m use_temp_path=off;
+
 server{
-    Listen ${LISTEN_PORT};
+    listen ${LISTEN_PORT};
+
+    # The shared volume is mounted at /vol/web in the app, which collects
+    # static files into /vol/web/static; media next to it stays private.
+    location /static/ {
+        alias /vol/static/static/;
+        # Serve the .gz files written by `manage.py compress_static`.
+        gzip_static on;
+        expires 7d;
+    }
+
+    # Uploaded media is authorized by the app, which answers with an
+    # X-Accel-Redirect into this location and sets the Cache-Control header.
+    location /protected-media/ {
+        internal;
+        alias /vol/static/media/;
+        etag on;
+    }
+
+    # Anonymous property reads honour the app's Cache-Control and are
+    # revalidated upstream with If-None-Match.
+    location /api/property/ {
+        uwsgi_pass           ${APP_HOST}:${APP_PORT};
+        include              /etc/nginx/uwsgi_params;
+        client_max_body_size 10M;
 
-    location /static {
-        alias /vol/static;
+        uwsgi_cache            api_cache;
+        uwsgi_cache_key        $scheme$host$request_uri$http_accept;
+        uwsgi_cache_methods    GET HEAD;
+        uwsgi_cache_revalidate on;
+        uwsgi_cache_lock       on;
+        uwsgi_cache_use_stale  updating error timeout;
+        uwsgi_cache_bypass     $http_authorization;
+        uwsgi_no_cache         $http_authorization;
+        add_header             X-Cache-Status $upstream_cache_status;
     }
 
-    locaton /{
+    location /{
         uwsgi_pass           ${APP_HOST}:${APP_PORT};
         include              /etc/nginx/uwsgi_params;
         client_max_body_size 10M;
     }
-}
\ No newline at end of file
+}
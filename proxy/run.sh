@@ -19,5 +19,6 @@ set -e
 #   placeholders for environment variables.
 # - Verify that the necessary environment variables are set before running this script.
 # - Ensure that Nginx is installed and properly configured on the system.
-envsubst < /etc/nginx/default.conf.tpl > /etc/nginx/conf.d/default.conf
+# Only our own variables are substituted so nginx variables such as $host survive.
+envsubst '${LISTEN_PORT} ${APP_HOST} ${APP_PORT}' < /etc/nginx/default.conf.tpl > /etc/nginx/conf.d/default.conf
 nginx -g 'daemon off;' 
\ No newline at end of file
@@ -2,7 +2,11 @@
 
 set -e
 
-python.py manage.py collectstatic --noinput
-python.py manage.py migrate
+python manage.py collectstatic --noinput
+python manage.py compress_static
+python manage.py migrate
+python manage.py build_schema
 
-uwsgi --socket :9000 --workers 4 --master-threads --module ecommerce.wsgi
\ No newline at end of file
+# The app is loaded once in the master and forked into the workers (no
+# --lazy-apps), so they share its memory copy-on-write.
+uwsgi --socket :9000 --master --workers 4 --enable-threads --need-app --module ecommerce.wsgi
\ No newline at end of file